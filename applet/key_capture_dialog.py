@@ -10,10 +10,13 @@ hardware_keycode - 8 = evdev keycode (linux/input-event-codes.h)
 import gi
 gi.require_version('Gtk', '3.0')
 from gi.repository import Gtk, Gdk
-import json
+import bisect
 from pathlib import Path
 
-from umlaut_paths import USER_CONFIG_DIR, USER_SETTINGS as SETTINGS_PATH
+from umlaut_paths import (
+    USER_CONFIG_DIR, USER_SETTINGS as SETTINGS_PATH,
+    atomic_write, json_loads as _loads, json_dumps as _dumps,
+)
 
 EVDEV_TO_NAME = {
     1:  'KEY_ESC',        2:  'KEY_1',           3:  'KEY_2',
@@ -46,19 +49,26 @@ EVDEV_TO_NAME = {
     111: 'KEY_DELETE',    125: 'KEY_LEFTMETA',    126: 'KEY_RIGHTMETA',
 }
 
-BOTH_PAIRS = {
-    'KEY_LEFTALT':    'KEY_RIGHTALT',
-    'KEY_RIGHTALT':   'KEY_LEFTALT',
-    'KEY_LEFTCTRL':   'KEY_RIGHTCTRL',
-    'KEY_RIGHTCTRL':  'KEY_LEFTCTRL',
-    'KEY_LEFTSHIFT':  'KEY_RIGHTSHIFT',
-    'KEY_RIGHTSHIFT': 'KEY_LEFTSHIFT',
-    'KEY_LEFTMETA':   'KEY_RIGHTMETA',
-    'KEY_RIGHTMETA':  'KEY_LEFTMETA',
-}
+# Left/right modifier pairs, each listed once
+_PAIRS = (
+    ('KEY_LEFTALT',   'KEY_RIGHTALT'),
+    ('KEY_LEFTCTRL',  'KEY_RIGHTCTRL'),
+    ('KEY_LEFTSHIFT', 'KEY_RIGHTSHIFT'),
+    ('KEY_LEFTMETA',  'KEY_RIGHTMETA'),
+)
+
+# Either side -> its partner
+BOTH_PAIRS = {a: b for a, b in _PAIRS} | {b: a for a, b in _PAIRS}
+
+# Resolved once — avoids a GI attribute lookup on every captured keypress
+_SHIFT_MASK = int(Gdk.ModifierType.SHIFT_MASK)
+
+# Key events arriving this soon after the capture click, or after the
+# previous event of the same key (autorepeat), are ignored (ms)
+CAPTURE_DEBOUNCE_MS = 50
 
 # Keys that should NOT be used as compose/target (pure modifiers)
-MODIFIER_EVDEV = set(BOTH_PAIRS.keys())
+MODIFIER_EVDEV = frozenset(key for pair in _PAIRS for key in pair)
 
 # Human-readable display names for keys without a printable character
 DISPLAY_NAMES = {
@@ -76,7 +86,10 @@ DISPLAY_NAMES = {
     'KEY_COMMA': ',',         'KEY_DOT': '.',            'KEY_SLASH': '/',
     'KEY_BACKSLASH': '\\',  'KEY_LEFTBRACE': '[',      'KEY_RIGHTBRACE': ']',
     'KEY_MINUS': '-',         'KEY_EQUAL': '=',          'KEY_KPASTERISK': '*',
-    **{f'KEY_F{n}': f'F{n}' for n in range(1, 13)},
+    'KEY_F1': 'F1',           'KEY_F2': 'F2',            'KEY_F3': 'F3',
+    'KEY_F4': 'F4',           'KEY_F5': 'F5',            'KEY_F6': 'F6',
+    'KEY_F7': 'F7',           'KEY_F8': 'F8',            'KEY_F9': 'F9',
+    'KEY_F10': 'F10',         'KEY_F11': 'F11',          'KEY_F12': 'F12',
 }
 
 
@@ -102,14 +115,27 @@ def evdev_to_display(evdev_name):
 
 def hw_to_evdev(hw_keycode):
     """X11 hardware_keycode -> evdev KEY_* name (no shift handling — raw key only)"""
-    return EVDEV_TO_NAME.get(hw_keycode - 8)
+    code = hw_keycode - 8
+    return _EVDEV_NAME_TBL[code] if 0 <= code < _TBL_SIZE else None
 
 
 def evdev_to_target(evdev_name):
     """KEY_A -> 'a', KEY_SEMICOLON -> 'KEY_SEMICOLON'"""
-    if evdev_name and evdev_name.startswith('KEY_') and len(evdev_name) == 5:
-        return evdev_name[4].lower()
-    return evdev_name
+    return EVDEV_TO_TARGET.get(evdev_name, evdev_name) if evdev_name else evdev_name
+
+
+# Lookup tables indexed by evdev code (hardware_keycode - 8), built once at
+# import so key capture is a single tuple index instead of re-parsing names.
+_TBL_SIZE          = 128
+_EVDEV_NAME_TBL    = tuple(EVDEV_TO_NAME.get(code) for code in range(_TBL_SIZE))
+_DISPLAY_TBL       = tuple(name and evdev_to_display(name) for name in _EVDEV_NAME_TBL)
+_SHIFT_DISPLAY_TBL = tuple(name and evdev_to_display(f'SHIFT+{name}') for name in _EVDEV_NAME_TBL)
+
+# evdev name -> sequence config target ('KEY_A' -> 'a'); other names map to themselves
+EVDEV_TO_TARGET = {
+    name: (name[4].lower() if name.startswith('KEY_') and len(name) == 5 else name)
+    for name in EVDEV_TO_NAME.values()
+}
 
 
 class KeyCaptureButton(Gtk.Button):
@@ -127,11 +153,16 @@ class KeyCaptureButton(Gtk.Button):
         self._capturing      = False
         self._dialog         = None
         self._handler_id     = None
+        self._last_evt_time  = 0   # X server timestamp (ms) of last seen event
+        self._last_hw        = None  # its hardware_keycode; None for the click
         self.evdev           = None
         self.connect('clicked', self._on_clicked)
 
     def _on_clicked(self, _):
         self._capturing = True
+        # X server timestamp of the click; 0 if not triggered by an event
+        self._last_evt_time = Gtk.get_current_event_time()
+        self._last_hw = None
         self.set_label("[ press a key… ]")
         self.set_sensitive(False)
         # Connect to the parent dialog's key-press-event
@@ -142,23 +173,37 @@ class KeyCaptureButton(Gtk.Button):
         if not self._capturing:
             return False
 
+        # Debounce on X server timestamps (no Python clock read): drop events
+        # within CAPTURE_DEBOUNCE_MS of the click or of the same key's previous
+        # event, so a key held through the click is ignored for its whole
+        # autorepeat run while a modifier quickly followed by a key is not
         hw = event.hardware_keycode
+        last, self._last_evt_time = self._last_evt_time, event.time
+        last_hw, self._last_hw = self._last_hw, hw
+        if event.time - last < CAPTURE_DEBOUNCE_MS and last_hw in (None, hw):
+            return True
+
         evdev = hw_to_evdev(hw)
 
+        if evdev is None:
+            # Unmapped key — report it and stop without any modifier work
+            self.evdev = None
+            self.set_label(f"? (hw={hw})")
+            self._stop_capture()
+            return True
+
         if not self.allow_modifiers and evdev in MODIFIER_EVDEV:
             # Ignore pure modifier press in non-modifier fields
             return True
 
-        if evdev:
-            if self.allow_shift:
-                shift = bool(event.state & Gdk.ModifierType.SHIFT_MASK)
-                if shift and not self.allow_modifiers:
-                    evdev = f'SHIFT+{evdev}'
-            self.evdev = evdev
-            self.set_label(evdev_to_display(evdev))
+        shift = (self.allow_shift and not self.allow_modifiers
+                 and bool(event.state & _SHIFT_MASK))
+        if shift:
+            self.evdev = f'SHIFT+{evdev}'
+            self.set_label(_SHIFT_DISPLAY_TBL[hw - 8])
         else:
-            self.evdev = None
-            self.set_label(f"? (hw={hw})")
+            self.evdev = evdev
+            self.set_label(_DISPLAY_TBL[hw - 8])
 
         self._stop_capture()
         return True
@@ -177,6 +222,10 @@ class KeyCaptureButton(Gtk.Button):
         self.set_label(placeholder)
 
 
+# Column indices of SequenceEditorDialog.store: compose, target, output
+_STORE_COLUMNS = [0, 1, 2]
+
+
 class SequenceEditorDialog(Gtk.Dialog):
 
     def __init__(self, parent, sequence_config_path):
@@ -186,14 +235,18 @@ class SequenceEditorDialog(Gtk.Dialog):
         self.seq_path   = Path(sequence_config_path)
         self.seq_config = self._load_json(self.seq_path, {"sequences": {}})
         self.settings   = self._load_json(SETTINGS_PATH, {})
+        # (compose, target) keys in display order; sorted once here, then
+        # kept sorted by bisect on add/delete
+        self._sorted_seq_keys = self._build_sorted_keys()
 
+        # Packed in display order: Cancel, then Save
+        action_area = self.get_action_area()
         btn_cancel = Gtk.Button(label="Cancel")
         btn_cancel.connect('clicked', lambda _: self.destroy())
-        self.get_action_area().pack_start(btn_cancel, False, False, 0)
-        self.get_action_area().reorder_child(btn_cancel, 0)
+        action_area.pack_start(btn_cancel, False, False, 0)
         self.btn_save = Gtk.Button(label="Save")
         self.btn_save.connect('clicked', self._on_save_clicked)
-        self.get_action_area().pack_start(self.btn_save, False, False, 0)
+        action_area.pack_start(self.btn_save, False, False, 0)
 
         box = self.get_content_area()
         box.set_spacing(8)
@@ -287,7 +340,12 @@ class SequenceEditorDialog(Gtk.Dialog):
         self.show_all()
         if initial_trigger not in BOTH_PAIRS:
             self.both_check.hide()
-        self._orig_snapshot = self._snapshot()
+        # Dirty tracking: meta fields compared directly, sequences via a key
+        # refreshed only when the sequences dict is mutated (_on_add/_on_delete)
+        self._orig_name      = self.name_entry.get_text()
+        self._orig_desc      = self.desc_entry.get_text()
+        self._seq_state      = self._seq_key()
+        self._orig_seq_state = self._seq_state
         self._saved = False
         self.both_check.connect('toggled', self._on_state_changed)
 
@@ -295,21 +353,76 @@ class SequenceEditorDialog(Gtk.Dialog):
 
     def _load_json(self, path, default):
         try:
-            with open(path) as f:
-                return json.load(f)
+            with open(path, 'rb') as f:
+                return _loads(f.read())
         except Exception:
             return default
 
     # ── Sequences ─────────────────────────────────────────────────────────
 
-    def _refresh_list(self):
-        self.store.clear()
+    def _build_sorted_keys(self):
+        keys = []
         for compose_key, targets in self.seq_config.get('sequences', {}).items():
             if isinstance(targets, dict):
-                for target, output in targets.items():
-                    self.store.append([compose_key, target, str(output)])
+                keys.extend((compose_key, target) for target in targets)
             elif isinstance(targets, str):
-                self.store.append([compose_key, '→ alias', targets])
+                keys.append((compose_key, '→ alias'))
+        keys.sort()
+        return keys
+
+    def _index_add(self, key):
+        i = bisect.bisect_left(self._sorted_seq_keys, key)
+        if i == len(self._sorted_seq_keys) or self._sorted_seq_keys[i] != key:
+            self._sorted_seq_keys.insert(i, key)
+
+    def _index_remove(self, key):
+        i = bisect.bisect_left(self._sorted_seq_keys, key)
+        if i < len(self._sorted_seq_keys) and self._sorted_seq_keys[i] == key:
+            del self._sorted_seq_keys[i]
+
+    def _list_rows(self):
+        """Flatten seq_config into (compose, target, output) rows, sorted by key."""
+        seqs = self.seq_config.get('sequences', {})
+        rows = []
+        for compose_key, target in self._sorted_seq_keys:
+            targets = seqs[compose_key]
+            if isinstance(targets, dict):
+                output = targets[target]
+                rows.append((compose_key, target, output if type(output) is str else str(output)))
+            else:
+                rows.append((compose_key, target, targets))
+        return rows
+
+    def _refresh_list(self):
+        """Sync the store with seq_config, touching only rows that changed.
+        Rows are kept in sorted key order, so surviving rows are already in
+        place and only new rows need inserting — no full clear + re-append."""
+        rows   = self._list_rows()
+        wanted = {(compose_key, target) for compose_key, target, _ in rows}
+
+        # Drop rows whose (compose, target) no longer exists
+        it = self.store.get_iter_first()
+        while it is not None:
+            if (self.store[it][0], self.store[it][1]) in wanted:
+                it = self.store.iter_next(it)
+            elif not self.store.remove(it):
+                it = None
+
+        # Merge: update matching rows in place, insert missing ones at their
+        # position in one call (ListStore iters persist across inserts)
+        it = self.store.get_iter_first()
+        for pos, (compose_key, target, output) in enumerate(rows):
+            if it is not None and self.store[it][0] == compose_key and self.store[it][1] == target:
+                if self.store[it][2] != output:
+                    self.store.set_value(it, 2, output)
+                it = self.store.iter_next(it)
+            else:
+                self.store.insert_with_valuesv(pos, _STORE_COLUMNS, [compose_key, target, output])
+
+        # Anything left past the merge point is out of order — drop it
+        while it is not None:
+            if not self.store.remove(it):
+                it = None
 
     def _on_sel_changed(self, selection):
         model, it = selection.get_selected()
@@ -334,8 +447,10 @@ class SequenceEditorDialog(Gtk.Dialog):
         seqs = self.seq_config.setdefault('sequences', {})
         if compose_key in seqs and isinstance(seqs[compose_key], dict):
             seqs[compose_key].pop(target, None)
+            self._index_remove((compose_key, target))
             if not seqs[compose_key]:
                 del seqs[compose_key]
+        self._seq_state = self._seq_key()
         self._refresh_list()
         self._reset_form()
         self.status_label.set_text("Deleted.")
@@ -358,6 +473,8 @@ class SequenceEditorDialog(Gtk.Dialog):
 
         target_cfg = evdev_to_target(target)
         self.seq_config.setdefault('sequences', {}).setdefault(compose, {})[target_cfg] = output
+        self._index_add((compose, target_cfg))
+        self._seq_state = self._seq_key()
         self._refresh_list()
         self.status_label.set_text(f"✓ Added: {compose} + {target_cfg} → {output}")
         self._reset_form()
@@ -371,13 +488,11 @@ class SequenceEditorDialog(Gtk.Dialog):
         self.btn_add.set_label("Add to List")
         self.tree.get_selection().unselect_all()
 
-    def _snapshot(self):
-        import json as _json
-        return _json.dumps({
-            'name': self.name_entry.get_text(),
-            'description': self.desc_entry.get_text(),
-            'sequences': self.seq_config.get('sequences', {})
-        }, sort_keys=True)
+    def _seq_key(self):
+        """Canonical, order-independent form of the sequences for comparison."""
+        return tuple(sorted(
+            (k, tuple(sorted(v.items())) if isinstance(v, dict) else v)
+            for k, v in self.seq_config.get('sequences', {}).items()))
 
     def _on_save_clicked(self, _):
         ok, err = self.save()
@@ -393,14 +508,18 @@ class SequenceEditorDialog(Gtk.Dialog):
             dlg.destroy()
 
     def _on_state_changed(self, *_):
-        self.btn_save.set_sensitive(self._snapshot() != self._orig_snapshot)
+        dirty = (self.name_entry.get_text() != self._orig_name
+                 or self.desc_entry.get_text() != self._orig_desc
+                 or self._seq_state != self._orig_seq_state)
+        self.btn_save.set_sensitive(dirty)
 
     def save(self):
         self.seq_config['name'] = self.name_entry.get_text()
         self.seq_config['description'] = self.desc_entry.get_text()
+        # Encode once and replace the file atomically, so a crash mid-save
+        # never leaves a torn config
         try:
-            with open(self.seq_path, 'w') as f:
-                json.dump(self.seq_config, f, indent=2, ensure_ascii=False)
+            atomic_write(self.seq_path, _dumps(self.seq_config))
         except Exception as e:
             return False, f"Failed to save sequences: {e}"
         return True, None
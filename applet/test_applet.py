@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Unit tests for umlaut_applet — daemon state handling and startup.
+Run from the applet/ directory: python3 test_applet.py
+"""
+
+import socket
+import sys
+import time
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Ensure both applet/ and lib/ (umlaut_paths) are importable; lib/ wins over
+# the dev copy of umlaut_paths kept in applet/
+sys.path.insert(0, str(Path(__file__).resolve().parent))                 # applet/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'lib'))  # lib/ (umlaut_paths)
+
+# ---------------------------------------------------------------------------
+# Mock gi before importing the applet
+# ---------------------------------------------------------------------------
+def _make_gi_mock():
+    gi = types.ModuleType("gi")
+    gi.require_version = MagicMock()
+    repository = types.ModuleType("gi.repository")
+    for name in ("AyatanaAppIndicator3", "Gtk", "GLib", "Gio"):
+        setattr(repository, name, MagicMock())
+    gi.repository = repository
+    sys.modules["gi"] = gi
+    sys.modules["gi.repository"] = repository
+    return gi
+
+_make_gi_mock()
+
+import umlaut_applet as _ap
+from umlaut_applet import UmlautApplet
+
+
+def make_applet():
+    """UmlautApplet with state fields set and UI updates recorded."""
+    applet = UmlautApplet.__new__(UmlautApplet)
+    applet.expected_running = None
+    applet.config_error = False
+    applet.config_error_msg = ''
+    applet._deferred_thens = []
+    applet._unit_proxy = None
+    applet._update_ui = MagicMock()
+    return applet
+
+
+def properties_changed(applet, active_state):
+    """Deliver a PropertiesChanged signal carrying ActiveState."""
+    params = MagicMock()
+    params.unpack.return_value = (_ap.SYSTEMD_UNIT_IFACE, {'ActiveState': active_state}, [])
+    applet._on_unit_properties_changed(None, None, None, None, None, params, None)
+
+
+class TestUnitPropertiesChanged(unittest.TestCase):
+
+    def test_start_passes_through_activating(self):
+        applet = make_applet()
+        applet.expected_running = True
+        properties_changed(applet, 'activating')
+        applet._update_ui.assert_not_called()
+        self.assertTrue(applet.expected_running)
+        properties_changed(applet, 'active')
+        applet._update_ui.assert_called_once_with('active')
+
+    def test_reload_state_ignored(self):
+        applet = make_applet()
+        properties_changed(applet, 'reloading')
+        applet._update_ui.assert_not_called()
+
+    def test_unexpected_stop_flagged(self):
+        applet = make_applet()
+        applet.expected_running = True
+        properties_changed(applet, 'inactive')
+        applet._update_ui.assert_called_once_with('error')
+        self.assertIsNone(applet.expected_running)
+
+
+class TestForcedPoll(unittest.TestCase):
+
+    def make_applet(self, active_state):
+        applet = make_applet()
+        applet._unit_proxy = MagicMock()
+        applet._unit_proxy.get_cached_property.return_value.get_string.return_value = active_state
+        return applet
+
+    def test_transitional_state_waits_for_signal(self):
+        applet = self.make_applet('activating')
+        applet.expected_running = True
+        then = MagicMock()
+        applet._force_poll_now(then=then)
+        applet._update_ui.assert_not_called()
+        then.assert_not_called()
+        self.assertTrue(applet.expected_running)
+        properties_changed(applet, 'active')
+        applet._update_ui.assert_called_once_with('active')
+        then.assert_called_once_with()
+
+    def test_settled_state_applied(self):
+        applet = self.make_applet('failed')
+        applet._fetch_error_msg = MagicMock()
+        applet._force_poll_now()
+        applet._update_ui.assert_called_once_with('failed')
+
+
+class TestStartupDelay(unittest.TestCase):
+
+    def setUp(self):
+        self.sock, self.peer = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.addCleanup(self.sock.close)
+        self.addCleanup(self.peer.close)
+
+    def test_quit_during_delay(self):
+        self.peer.send(b'quit')
+        start = time.monotonic()
+        self.assertTrue(_ap._sleep_unless_replaced(self.sock, 5))
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_delay_elapses(self):
+        self.assertFalse(_ap._sleep_unless_replaced(self.sock, 0.05))
+
+    def test_other_message_ignored(self):
+        self.peer.send(b'ping')
+        self.assertFalse(_ap._sleep_unless_replaced(self.sock, 0.05))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
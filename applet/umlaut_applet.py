@@ -15,18 +15,30 @@ except ValueError:
     gi.require_version('AppIndicator3', '0.1')
     from gi.repository import AppIndicator3
 
-from gi.repository import Gtk, GLib
+from gi.repository import Gtk, GLib, Gio
+import argparse
 import subprocess
 import os
+import re
+import errno
 import logging
 import signal
+import select
+import socket
+import time
 from umlaut_paths import (
     APPLET_SCRIPT, USER_SETTINGS,
     UMLAUT_CTL, SYSTEM_ICON_DIR as _SYS_ICON_DIR,
     USER_ICON_DIR as _USR_ICON_DIR,
     USER_CONFIG_DIR as _USR_CFG_DIR,
+    json_loads as _loads,
 )
 
+try:
+    from systemd import journal as _journal
+except ImportError:
+    _journal = None  # python3-systemd not installed; use journalctl
+
 logger = logging.getLogger('umlaut-applet')
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
@@ -40,11 +52,77 @@ USER_CONFIG_DIR = str(_USR_CFG_DIR)
 ICON_ACTIVE   = 'input-keyboard'
 ICON_INACTIVE = 'input-keyboard-symbolic'
 
+# Icon states used by _UI_STATE; resolved up front in _reload_icon_set
+ICON_STATES = ('active', 'inactive', 'error')
+
+# systemd D-Bus API (user bus)
+SYSTEMD_BUS_NAME   = 'org.freedesktop.systemd1'
+SYSTEMD_OBJ_PATH   = '/org/freedesktop/systemd1'
+SYSTEMD_MANAGER    = 'org.freedesktop.systemd1.Manager'
+SYSTEMD_UNIT_IFACE = 'org.freedesktop.systemd1.Unit'
+UMLAUT_UNIT        = 'umlaut.service'
+
+# ActiveState values the applet reacts to; transitional ones are ignored
+_SETTLED_STATES = frozenset(('active', 'inactive', 'failed'))
+
+# Abstract UNIX socket used as a single-instance lock and control channel
+APPLET_SOCKET = '\0umlaut-applet'
+
+
+# Menu/icon presentation per daemon state:
+# (label, icon_state, icon_label, start_vis, stop_vis, restart_vis,
+#  start_sens, stop_sens, restart_sens, seps_vis, error_sep_vis)
+_UI_STATE = {
+    'active':   ('🟢 Running',          'active', 'Umlaut Running',
+                 True,  True,  True,  False, True,  True,  True,  False),
+    'inactive': ('⚪ Stopped',           'inactive', 'Umlaut Stopped',
+                 True,  True,  True,  True,  False, False, True,  False),
+    'failed':   ('🔴 Failed to start',  'error',  'Umlaut Failed',
+                 True,  False, False, True,  False, False, False, True),
+    'error':    ('🔴 Error - check log','error',  'Umlaut Error',
+                 True,  False, False, True,  False, False, True,  False),
+}
+
+
+_ERR_RE = re.compile(r'\b(?:ERROR|FATAL)\b')
+
+
+def _list_dir(directory: str) -> frozenset:
+    """Names of the entries in directory; empty if it can't be read."""
+    try:
+        with os.scandir(directory) as it:
+            return frozenset(entry.name for entry in it)
+    except OSError:
+        return frozenset()
+
+
+def _pick_error_line(lines: list) -> str:
+    """Prefer the last ERROR/FATAL line; fall back to the last line."""
+    errors = [l for l in lines if _ERR_RE.search(l)]
+    return errors[-1] if errors else (lines[-1] if lines else '')
+
+
+def _map_active_state(status: str) -> str:
+    """Collapse a systemd ActiveState into 'active', 'failed', or 'inactive'."""
+    if status == 'active':
+        return 'active'
+    elif status == 'failed':
+        return 'failed'
+    else:
+        return 'inactive'
+
+
+def _settled_state(status: str):
+    """Like _map_active_state, but None for transitional states."""
+    return _map_active_state(status) if status in _SETTLED_STATES else None
+
 
 class UmlautApplet:
     def __init__(self):
         # Load icon set before first _get_icon call
         self._icon_set = 'default'
+        self._icons = {}  # state -> resolved path or theme name for _icon_set
+        self._settings_mtime = None
         self._reload_icon_set()
 
         self.indicator = AppIndicator3.Indicator.new(
@@ -59,46 +137,75 @@ class UmlautApplet:
         self.expected_running = None  # What we expect after last command
         self.config_error = False       # Persistent failed state
         self.config_error_msg = ''      # Error message from daemon
+        self._last_ui_state = None      # State last rendered by _flush_ui
+        self._pending_state = None      # Latest state queued by _update_ui
+        self._flush_scheduled = False
+        self._journal = None            # systemd.journal.Reader, opened on first failure
+        self._deferred_thens = []       # _update_status callbacks waiting out a transition
         
         # Track child processes (like config manager)
         self.manager_process = None  # Single config manager instance
         # On SIGTERM (external kill): quit cleanly but don't kill children —
         # config manager may have been opened intentionally and should survive.
         # Children are only killed on explicit Quit from the menu.
-        signal.signal(signal.SIGTERM, lambda *_: GLib.idle_add(Gtk.main_quit))
+        GLib.unix_signal_add(GLib.PRIORITY_HIGH, signal.SIGTERM, self._on_sigterm)
 
         # Build menu
         self.menu = Gtk.Menu()
         self._build_menu()
         self.indicator.set_menu(self.menu)
 
-        # Start status polling (every 3 seconds)
-        GLib.timeout_add_seconds(3, self._poll_status)
+        # Follow daemon state via systemd D-Bus signals; poll every 3 seconds
+        # only if the bus is unavailable
+        self._bus = None
+        self._unit_proxy = None
+        self._watch_unit()
+        if self._bus is None:
+            GLib.timeout_add_seconds(3, self._poll_status)
 
         # Initial status check (do it directly, don't use idle_add with a function that returns True)
         self._force_poll_now()
 
+    def _on_sigterm(self) -> bool:
+        Gtk.main_quit()
+        return False
+
     def _reload_icon_set(self):
-        """Read icon_set from settings.config.json and cache it."""
-        import json
+        """Read icon_set from settings.config.json and cache it.
+        Skips the parse when the file's mtime is unchanged since the last read."""
+        path = os.path.join(USER_CONFIG_DIR, 'settings.config.json')
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime is not None and mtime == self._settings_mtime:
+            return
+        self._settings_mtime = mtime
         try:
-            with open(os.path.join(USER_CONFIG_DIR, 'settings.config.json')) as f:
-                self._icon_set = json.load(f).get('icon_set', 'default').lower()
+            with open(path, 'rb') as f:
+                self._icon_set = _loads(f.read()).get('icon_set', 'default').lower()
         except Exception:
             self._icon_set = 'default'
+        # One directory read per icon dir instead of a stat per candidate
+        available = {d: _list_dir(d) for d in (USER_ICON_DIR, SYSTEM_ICON_DIR)}
+        self._icons = {state: self._find_icon(self._icon_set, state, available)
+                       for state in ICON_STATES}
 
     def _get_icon(self, state: str) -> str:
-        """Get icon path for current icon_set and state.
-        Falls back to 'default' icon set if named set not found.
+        """Get icon path for current icon_set and state, resolved at reload."""
+        return self._icons[state]
+
+    @staticmethod
+    def _find_icon(icon_set: str, state: str, available: dict) -> str:
+        """Falls back to 'default' icon set if named set not found.
         Falls back to theme icon name if file not found.
+        available maps each icon directory to the filenames it contains.
         """
-        icon_set = self._icon_set
         for candidate in [icon_set, 'default']:
             filename = f'{candidate}.{state}.png'
             for directory in [USER_ICON_DIR, SYSTEM_ICON_DIR]:
-                path = os.path.join(directory, filename)
-                if os.path.exists(path):
-                    return path
+                if filename in available[directory]:
+                    return os.path.join(directory, filename)
         # Fallbacks
         if state == 'error':
             return 'dialog-error'
@@ -112,8 +219,13 @@ class UmlautApplet:
         self.status_item.set_sensitive(False)
         self.menu.append(self.status_item)
 
+        # Plain separators, toggled together in _update_ui
+        self._separators = []
+
         # Separator
-        self.menu.append(Gtk.SeparatorMenuItem())
+        sep = Gtk.SeparatorMenuItem()
+        self._separators.append(sep)
+        self.menu.append(sep)
 
         # Start
         self.start_item = Gtk.MenuItem(label='Start')
@@ -140,7 +252,9 @@ class UmlautApplet:
         self.menu.append(self.configure_item)
 
         # Separator
-        self.menu.append(Gtk.SeparatorMenuItem())
+        sep = Gtk.SeparatorMenuItem()
+        self._separators.append(sep)
+        self.menu.append(sep)
 
         # Quit
         quit_item = Gtk.MenuItem(label='Quit')
@@ -149,37 +263,96 @@ class UmlautApplet:
 
         self.menu.show_all()
 
-    def _run_control(self, *args) -> tuple:
-        """Run the umlaut control script (no sudo - user service)"""
+    def _spawn(self, argv: list, timeout: int, on_done):
+        """Run argv without blocking the main loop.
+        Calls on_done(returncode, stdout, stderr); returncode is None if the
+        command could not be run or timed out."""
         try:
-            result = subprocess.run(
-                [UMLAUT_CONTROL] + list(args),
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return result.returncode == 0, result.stdout.strip(), result.stderr.strip()
-        except subprocess.TimeoutExpired:
-            return False, '', 'Command timed out'
-        except Exception as ex:
-            return False, '', str(ex)
-
-    def _get_daemon_state(self) -> str:
-        """Returns 'active', 'failed', or 'inactive'."""
+            proc = Gio.Subprocess.new(
+                argv, Gio.SubprocessFlags.STDOUT_PIPE | Gio.SubprocessFlags.STDERR_PIPE)
+        except GLib.Error as ex:
+            on_done(None, '', ex.message)
+            return
+        cancellable = Gio.Cancellable()
+
+        def _on_timeout():
+            cancellable.cancel()
+            return False
+
+        timer = GLib.timeout_add_seconds(timeout, _on_timeout)
+
+        def _on_finished(p, res):
+            try:
+                _, out, err = p.communicate_utf8_finish(res)
+            except GLib.Error as ex:
+                p.force_exit()
+                if cancellable.is_cancelled():
+                    on_done(None, '', 'Command timed out')
+                else:
+                    GLib.source_remove(timer)
+                    on_done(None, '', ex.message)
+                return
+            GLib.source_remove(timer)
+            rc = p.get_exit_status() if p.get_if_exited() else None
+            on_done(rc, (out or '').strip(), (err or '').strip())
+
+        proc.communicate_utf8_async(None, cancellable, _on_finished)
+
+    def _run_control(self, *args, on_done):
+        """Run the umlaut control script (no sudo - user service).
+        Calls on_done(success, stdout, stderr) when it finishes."""
+        self._spawn([UMLAUT_CONTROL] + list(args), 10,
+                    lambda rc, out, err: on_done(rc == 0, out, err))
+
+    def _watch_unit(self):
+        """Subscribe to PropertiesChanged on the umlaut unit over the user bus.
+        Leaves self._bus as None (polling fallback) if systemd is unreachable."""
         try:
-            result = subprocess.run(
-                ['systemctl', '--user', 'is-active', 'umlaut'],
-                capture_output=True, text=True, timeout=5
-            )
-            status = result.stdout.strip()
-            if status == 'active':
-                return 'active'
-            elif status == 'failed':
-                return 'failed'
-            else:
-                return 'inactive'
-        except Exception:
-            return 'inactive'
+            bus = Gio.bus_get_sync(Gio.BusType.SESSION, None)
+            # LoadUnit rather than GetUnit: works even if the unit isn't loaded yet
+            unit_path = bus.call_sync(
+                SYSTEMD_BUS_NAME, SYSTEMD_OBJ_PATH, SYSTEMD_MANAGER, 'LoadUnit',
+                GLib.Variant('(s)', (UMLAUT_UNIT,)), GLib.VariantType('(o)'),
+                Gio.DBusCallFlags.NONE, -1, None).unpack()[0]
+            # systemd only emits unit signals once a client has subscribed
+            bus.call_sync(
+                SYSTEMD_BUS_NAME, SYSTEMD_OBJ_PATH, SYSTEMD_MANAGER, 'Subscribe',
+                None, None, Gio.DBusCallFlags.NONE, -1, None)
+            bus.signal_subscribe(
+                SYSTEMD_BUS_NAME, 'org.freedesktop.DBus.Properties', 'PropertiesChanged',
+                unit_path, SYSTEMD_UNIT_IFACE, Gio.DBusSignalFlags.NONE,
+                self._on_unit_properties_changed, None)
+            # Property cache for forced queries; kept current by the same signals
+            proxy = Gio.DBusProxy.new_sync(
+                bus, Gio.DBusProxyFlags.DO_NOT_CONNECT_SIGNALS, None,
+                SYSTEMD_BUS_NAME, unit_path, SYSTEMD_UNIT_IFACE, None)
+        except GLib.Error as ex:
+            logger.warning(f"systemd D-Bus unavailable, falling back to polling: {ex.message}")
+            return
+        self._bus = bus
+        self._unit_proxy = proxy
+
+    def _on_unit_properties_changed(self, _conn, _sender, _path, _iface, _signal, params, _data):
+        _, changed, _ = params.unpack()
+        active_state = changed.get('ActiveState')
+        # Skip transitional states (activating, deactivating, reloading): a
+        # Start/Restart passes through them before 'active', and mapping them
+        # to 'inactive' would flag the pending start as an error
+        if active_state not in _SETTLED_STATES:
+            return
+        self._update_status(_map_active_state(active_state))
+
+    def _get_daemon_state(self, on_done):
+        """Calls on_done with 'active', 'failed', or 'inactive', or with None
+        while the unit is mid-transition (activating, reloading, ...)."""
+        if self._unit_proxy is not None:
+            active_state = self._unit_proxy.get_cached_property('ActiveState')
+            if active_state is not None:
+                on_done(_settled_state(active_state.get_string()))
+                return
+        self._spawn(['systemctl', '--user', 'is-active', 'umlaut'], 5,
+                    lambda rc, out, err: on_done(
+                        _settled_state(out) if rc is not None else 'inactive'))
 
     def _poll_status(self) -> bool:
         """Poll daemon status. Returns False (stops polling) when in config_error state."""
@@ -188,28 +361,72 @@ class UmlautApplet:
         self._update_status()
         return True
 
-    def _force_poll_now(self):
-        self._update_status()
-
-    def _update_status(self):
-        """Check daemon status and update UI accordingly."""
-        state = self._get_daemon_state()
-
+    def _force_poll_now(self, then=None):
+        self._update_status(then=then)
+
+    def _update_status(self, state: str = None, then=None):
+        """Update UI for a daemon state; queries systemd if state is None.
+        then, if given, runs once the UI reflects the new state. If the unit
+        is mid-transition, the UI is left alone and then waits for the next
+        settled state (PropertiesChanged signal or poll)."""
+        if state is None:
+            def _on_state(st):
+                if st is not None:
+                    self._update_status(st, then)
+                elif then:
+                    self._deferred_thens.append(then)
+            self._get_daemon_state(_on_state)
+            return
+        self._apply_state(state)
+        if then:
+            then()
+        if self._deferred_thens:
+            thens, self._deferred_thens = self._deferred_thens, []
+            for fn in thens:
+                fn()
+
+    def _fetch_error_msg(self):
+        """Pull the most relevant line from the daemon journal into config_error_msg."""
+        self.config_error_msg = 'Daemon failed to start'
+
+        if _journal is not None:
+            try:
+                msg = _pick_error_line(self._journal_tail(20))
+            except OSError as ex:
+                logger.warning(f"Journal read failed, falling back to journalctl: {ex}")
+            else:
+                if msg:
+                    self.config_error_msg = msg
+                return
+
+        def _on_journal(rc, out, err):
+            msg = _pick_error_line(out.splitlines())
+            if msg and self.config_error:
+                self.config_error_msg = msg
+
+        self._spawn(['journalctl', '--user', '-u', 'umlaut', '-n', '20',
+                     '--no-pager', '-o', 'cat'], 5, _on_journal)
+
+    def _journal_tail(self, count: int) -> list:
+        """Last count messages from the umlaut unit, oldest first."""
+        if self._journal is None:
+            self._journal = _journal.Reader(_journal.CURRENT_USER)
+            self._journal.add_match(_SYSTEMD_USER_UNIT=UMLAUT_UNIT)
+        j = self._journal
+        j.seek_tail()
+        lines = []
+        for _ in range(count):
+            entry = j.get_previous()
+            if not entry:
+                break
+            lines.append(entry.get('MESSAGE', ''))
+        lines.reverse()
+        return lines
+
+    def _apply_state(self, state: str):
         if state == 'failed':
             if not self.config_error_msg:
-                try:
-                    result = subprocess.run(
-                        ['journalctl', '--user', '-u', 'umlaut', '-n', '20',
-                         '--no-pager', '-o', 'cat'],
-                        capture_output=True, text=True, timeout=5
-                    )
-                    lines = result.stdout.strip().splitlines()
-                    # Prefer ERROR lines; fall back to last non-empty line
-                    errors = [l for l in lines if 'ERROR' in l or 'FATAL' in l]
-                    msg = errors[-1] if errors else (lines[-1] if lines else '')
-                    self.config_error_msg = msg if msg else 'Daemon failed to start'
-                except Exception:
-                    self.config_error_msg = 'Daemon failed to start'
+                self._fetch_error_msg()
             self.config_error = True
             self._update_ui('failed')
             return
@@ -234,23 +451,26 @@ class UmlautApplet:
             self._update_ui(state)
 
     def _update_ui(self, state: str):
+        """Schedule an icon/menu update; bursts of states within one main
+        loop iteration (e.g. during start/restart) collapse to the last."""
+        self._pending_state = state
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            GLib.idle_add(self._flush_ui)
+
+    def _flush_ui(self) -> bool:
         """Update icon and menu items based on daemon state."""
-        # (label, icon_state, icon_label, start_vis, stop_vis, restart_vis,
-        #  start_sens, stop_sens, restart_sens, seps_vis, error_sep_vis)
-        _STATE = {
-            'active':   ('🟢 Running',          'active', 'Umlaut Running',
-                         True,  True,  True,  False, True,  True,  True,  False),
-            'inactive': ('⚪ Stopped',           'inactive', 'Umlaut Stopped',
-                         True,  True,  True,  True,  False, False, True,  False),
-            'failed':   ('🔴 Failed to start',  'error',  'Umlaut Failed',
-                         True,  False, False, True,  False, False, False, True),
-            'error':    ('🔴 Error - check log','error',  'Umlaut Error',
-                         True,  False, False, True,  False, False, True,  False),
-        }
+        self._flush_scheduled = False
+        state = self._pending_state
+        # Nothing in the menu depends on anything but state; skip the GTK
+        # round-trips on the (common) ticks where it hasn't changed
+        if state == self._last_ui_state:
+            return False
+        self._last_ui_state = state
         (label, icon_state, icon_label,
          start_vis, stop_vis, restart_vis,
          start_sens, stop_sens, restart_sens,
-         seps_vis, error_sep_vis) = _STATE.get(state, _STATE['inactive'])
+         seps_vis, error_sep_vis) = _UI_STATE.get(state, _UI_STATE['inactive'])
 
         self.status_item.set_label(label)
         self.indicator.set_icon_full(self._get_icon(icon_state), icon_label)
@@ -260,31 +480,38 @@ class UmlautApplet:
         self.start_item.set_sensitive(start_sens)
         self.stop_item.set_sensitive(stop_sens)
         self.restart_item.set_sensitive(restart_sens)
-        for child in self.menu.get_children():
-            if isinstance(child, Gtk.SeparatorMenuItem):
-                child.set_visible(seps_vis)
+        for sep in self._separators:
+            sep.set_visible(seps_vis)
         self.error_sep.set_visible(error_sep_vis)
-        self.menu.show_all()
+        return False
 
     def _on_start(self, _):
         self.expected_running = True
-        success, out, err = self._run_control('start')
+        self._run_control('start', on_done=lambda ok, out, err:
+                          self._after_start(ok, err, 'Failed to start Umlaut'))
+
+    def _after_start(self, success: bool, err: str, title: str):
+        """Shared completion for start and restart."""
         if not success:
             # Check if it's a config error (daemon wrote error file)
-            self._force_poll_now()  # will set config_error if state is 'failed'
-            if not self.config_error:
-                self._show_error('Failed to start Umlaut', err)
-            self.expected_running = None
+            def _report():
+                if not self.config_error:
+                    self._show_error(title, err)
+                self.expected_running = None
+            self._force_poll_now(then=_report)  # will set config_error if state is 'failed'
         else:
             # Successful start — clear any previous error state, resume polling
             self.config_error = False
             self.config_error_msg = ''
-            GLib.timeout_add_seconds(3, self._poll_status)
+            if self._bus is None:
+                GLib.timeout_add_seconds(3, self._poll_status)
             self._force_poll_now()
 
     def _on_stop(self, _):
         self.expected_running = False
-        success, out, err = self._run_control('stop')
+        self._run_control('stop', on_done=self._after_stop)
+
+    def _after_stop(self, success: bool, out: str, err: str):
         if not success:
             self._show_error('Failed to stop Umlaut', err)
             self.expected_running = None
@@ -292,17 +519,8 @@ class UmlautApplet:
 
     def _on_restart(self, _):
         self.expected_running = True
-        success, out, err = self._run_control('restart')
-        if not success:
-            self._force_poll_now()
-            if not self.config_error:
-                self._show_error('Failed to restart Umlaut', err)
-            self.expected_running = None
-        else:
-            self.config_error = False
-            self.config_error_msg = ''
-            GLib.timeout_add_seconds(3, self._poll_status)
-            self._force_poll_now()
+        self._run_control('restart', on_done=lambda ok, out, err:
+                          self._after_start(ok, err, 'Failed to restart Umlaut'))
 
     def _kill_manager(self):
         """Terminate config manager if running."""
@@ -316,9 +534,13 @@ class UmlautApplet:
 
     def _on_configure(self, _):
         """Open config manager GUI — ensure only one instance runs."""
-        # Kill any existing instance by script name (survives applet restarts)
-        subprocess.run(['pkill', '-f', 'umlaut_config_manager.py'],
-                       capture_output=True)
+        if self.manager_process is not None:
+            self._kill_manager()
+        else:
+            # No handle yet: an instance may survive from a previous applet
+            # run, so fall back to killing by script name once
+            subprocess.run(['pkill', '-f', 'umlaut_config_manager.py'],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         try:
             self.manager_process = subprocess.Popen(
                 ['/usr/local/bin/umlaut-scripts/umlaut_config_manager.py'])
@@ -344,43 +566,84 @@ class UmlautApplet:
         dialog.destroy()
 
 
-def _kill_existing_applet():
-    """Kill any existing umlaut_applet process (except ourselves)"""
-    import signal
-    my_pid = os.getpid()
+def _claim_single_instance():
+    """Bind the applet's abstract control socket, asking a running applet to
+    quit and waiting for it to release the address if needed.
+    Returns the bound socket (keep it open for the process lifetime), or None."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    for _ in range(30):
+        try:
+            sock.bind(APPLET_SOCKET)
+            return sock
+        except OSError as e:
+            if e.errno != errno.EADDRINUSE:
+                logger.warning(f"Failed to bind applet socket: {e}")
+                break
+        try:
+            sock.sendto(b'quit', APPLET_SOCKET)
+        except OSError:
+            pass  # holder went away between bind and send; retry bind
+        time.sleep(0.1)
+    else:
+        logger.warning("Existing applet did not exit; starting anyway")
+    sock.close()
+    return None
+
+
+def _on_ctrl_msg(_fd, _condition, sock) -> bool:
+    """Handle a message on the control socket from a newer applet instance."""
     try:
-        result = subprocess.run(
-            ['pgrep', '-f', 'umlaut_applet'],
-            capture_output=True, text=True
-        )
-        for pid_str in result.stdout.strip().splitlines():
-            pid = int(pid_str)
-            if pid != my_pid:
-                try:
-                    os.kill(pid, signal.SIGTERM)
-                    logger.info(f"Killed existing applet process {pid}")
-                except ProcessLookupError:
-                    pass
-    except Exception as e:
-        logger.warning(f"Failed to kill existing applet: {e}")
+        msg = sock.recv(64)
+    except OSError:
+        return True
+    if msg == b'quit':
+        logger.info("Replaced by a new applet instance, quitting")
+        Gtk.main_quit()
+    return True
+
+
+def _sleep_unless_replaced(sock, seconds: float) -> bool:
+    """Sleep for the startup delay while still answering the control socket.
+    Returns True if a newer instance asked this one to quit meanwhile."""
+    if sock is None:
+        time.sleep(seconds)
+        return False
+    deadline = time.monotonic() + seconds
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        ready, _, _ = select.select([sock], [], [], remaining)
+        if not ready:
+            return False
+        try:
+            if sock.recv(64) == b'quit':
+                return True
+        except OSError:
+            pass
 
 
 def main():
     # Parse args
-    import argparse
     parser = argparse.ArgumentParser(description='Umlaut System Tray Applet')
     parser.add_argument('--delay', type=int, default=0,
                         help='Delay in seconds before starting (for autostart)')
     args = parser.parse_args()
 
-    # Kill any existing applet instance
-    _kill_existing_applet()
+    # Take over from any existing applet instance, and listen for the same
+    # request from a newer one from here on
+    ctrl_sock = _claim_single_instance()
+    if ctrl_sock is not None:
+        GLib.io_add_watch(ctrl_sock.fileno(), GLib.PRIORITY_DEFAULT, GLib.IO_IN,
+                          _on_ctrl_msg, ctrl_sock)
 
-    # Apply startup delay if requested
+    # Apply startup delay if requested; the main loop isn't running yet, so
+    # a takeover request during the delay is handled here
     if args.delay > 0:
         logger.info(f"Waiting {args.delay}s before starting...")
-        import time
-        time.sleep(args.delay)
+        if _sleep_unless_replaced(ctrl_sock, args.delay):
+            logger.info("Replaced by a new applet instance during startup delay, exiting")
+            return
 
     # Start applet
     applet = UmlautApplet()
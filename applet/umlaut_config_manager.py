@@ -5,19 +5,23 @@ Umlaut Config Manager - GUI for managing keyboard remapping configs
 
 import gi
 gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk, Gdk, GLib, GObject, GdkPixbuf, Pango
+from gi.repository import Gtk, Gdk, Gio, GLib, GdkPixbuf, Pango
+import copy
 import json
 import os
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 import re
 import signal
+import evdev.ecodes as _ec
 
 from umlaut_paths import (
     SYSTEM_ICON_DIR, USER_CONFIG_DIR,
     USER_ICON_DIR, USER_SETTINGS as SETTINGS_PATH,
     load_settings, save_settings,
-    APPLET_SCRIPT, TEST_MODE_FILE
+    APPLET_SCRIPT, TEST_MODE_FILE, atomic_write,
+    json_loads as _loads, json_dumps as _dumps,
 )
 
 # Paths imported from umlaut_paths
@@ -58,6 +62,10 @@ EVDEV_TO_NAME = {
     111: 'KEY_DELETE',    125: 'KEY_LEFTMETA',    126: 'KEY_RIGHTMETA',
 }
 
+# Dense code-indexed copy of EVDEV_TO_NAME for hw_to_evdev (one per key event)
+_TBL_SIZE       = 128
+_EVDEV_NAME_TBL = tuple(EVDEV_TO_NAME.get(code) for code in range(_TBL_SIZE))
+
 BOTH_PAIRS = {
     'KEY_LEFTALT':    'KEY_RIGHTALT',
     'KEY_RIGHTALT':   'KEY_LEFTALT',
@@ -72,6 +80,14 @@ BOTH_PAIRS = {
 # Keys that should NOT be used as compose/target (pure modifiers)
 MODIFIER_EVDEV = set(BOTH_PAIRS.keys())
 
+# Key events arriving this soon after the capture click, or after the
+# previous event of the same key (autorepeat), are ignored (ms)
+CAPTURE_DEBOUNCE_MS = 50
+
+# Keyboard grab for the sequence tester: retries while the window maps
+GRAB_RETRIES  = 5
+GRAB_RETRY_MS = 50
+
 # Human-readable display names for keys without a printable character
 DISPLAY_NAMES = {
     'KEY_ESC': 'Esc',         'KEY_TAB': 'Tab',        'KEY_ENTER': 'Enter',
@@ -92,31 +108,48 @@ DISPLAY_NAMES = {
 }
 
 
+def _display_label(base):
+    """Label for an unprefixed evdev name.
+    Single letters -> lowercase char, numbers -> digit, rest -> DISPLAY_NAMES or short name.
+    """
+    if base in DISPLAY_NAMES:
+        return DISPLAY_NAMES[base]
+    elif base.startswith('KEY_') and len(base) == 5:
+        return base[4].lower()  # KEY_A -> 'a'
+    elif base.startswith('KEY_') and base[4:].isdigit():
+        return base[4:]         # KEY_1 -> '1'
+    else:
+        return base[4:].lower() if base.startswith('KEY_') else base  # KEY_COMMA -> 'comma'
+
+
+# Labels for every key the capture button can produce, resolved up front
+_EVDEV_DISPLAY = {name: _display_label(name)
+                  for name in (*EVDEV_TO_NAME.values(), *DISPLAY_NAMES)}
+
+
+@lru_cache(maxsize=512)
 def evdev_to_display(evdev_name):
     """Return human-readable label for an evdev key name.
-    Single letters -> lowercase char, numbers -> digit, rest -> DISPLAY_NAMES or short name.
+    Known keys come from _EVDEV_DISPLAY; anything else goes through _display_label.
     Handles SHIFT+ prefix.
     """
     if not evdev_name:
         return '?'
     shift = evdev_name.startswith('SHIFT+')
     base = evdev_name[6:] if shift else evdev_name
-    if base in DISPLAY_NAMES:
-        label = DISPLAY_NAMES[base]
-    elif base.startswith('KEY_') and len(base) == 5:
-        label = base[4].lower()  # KEY_A -> 'a'
-    elif base.startswith('KEY_') and base[4:].isdigit():
-        label = base[4:]         # KEY_1 -> '1'
-    else:
-        label = base[4:].lower() if base.startswith('KEY_') else base  # KEY_COMMA -> 'comma'
+    label = _EVDEV_DISPLAY.get(base)
+    if label is None:
+        label = _display_label(base)
     return f'Shift+{label}' if shift else label
 
 
 def hw_to_evdev(hw_keycode):
     """X11 hardware_keycode -> evdev KEY_* name (no shift handling — raw key only)"""
-    return EVDEV_TO_NAME.get(hw_keycode - 8)
+    code = hw_keycode - 8
+    return _EVDEV_NAME_TBL[code] if 0 <= code < _TBL_SIZE else None
 
 
+@lru_cache(maxsize=512)
 def evdev_to_target(evdev_name):
     """Convert evdev key name to JSON-friendly target string.
     Single letters/digits -> lowercase char.
@@ -149,23 +182,20 @@ def evdev_to_target(evdev_name):
     return evdev_name
 
 
-def _any_capture_active(btns):
-    """Return True if any KeyCaptureButton in the list is mid-capture."""
-    return any(btn._handler_id is not None for btn in btns)
+def _any_capture_active():
+    """Return True if any KeyCaptureButton is mid-capture."""
+    return KeyCaptureButton._active_captures > 0
 
 class KeyCaptureButton(Gtk.Button):
     """
     Button that captures the next keypress when clicked.
-    Emits 'key-captured' signal with the captured evdev name (str) when done.
+    Calls connect_captured() listeners with the captured evdev name (str) when done.
     allow_trigger_keys: if True, accepts bare modifier/trigger keys (for trigger key field)
     allow_shift: if True, prefixes SHIFT+ for shifted keys (for compose/target)
     """
 
-    __gsignals__ = {
-        # Emitted when capture completes or is aborted.
-        # arg: evdev name (e.g. 'KEY_A', 'SHIFT+KEY_A') or '' if aborted via ESC.
-        'key-captured': (GObject.SignalFlags.RUN_FIRST, None, (str,)),
-    }
+    # Buttons currently mid-capture, across all windows
+    _active_captures = 0
 
     def __init__(self, label="Click to capture", allow_trigger_keys=False, allow_shift=True):
         super().__init__(label=label)
@@ -173,29 +203,49 @@ class KeyCaptureButton(Gtk.Button):
         self.allow_shift     = allow_shift
         self._dialog         = None
         self._handler_id     = None
+        self._last_evt_time  = 0   # X server timestamp (ms) of last seen event
+        self._last_hw        = None  # its hardware_keycode; None for the click
         self.evdev           = None
         self._prev_evdev     = None
         self._prev_label     = label
+        self._captured_listeners = []
         self.connect('clicked', self._on_clicked)
+        # Keep _active_captures balanced if the window closes mid-capture
+        self.connect('destroy', lambda _: self._stop_capture())
 
     def _on_clicked(self, _):
         self._prev_evdev = self.evdev
         self._prev_label = self.get_label()
-        self.set_label("[ press a key… ]")
-        self.set_sensitive(False)
+        # X server timestamp of the click; 0 if not triggered by an event
+        self._last_evt_time = Gtk.get_current_event_time()
+        self._last_hw = None
+        with self.freeze_notify():  # one batch of notify:: emissions
+            self.set_label("[ press a key… ]")
+            self.set_sensitive(False)
         self._dialog = self.get_toplevel()
         self._handler_id = self._dialog.connect('key-press-event', self._on_key)
+        KeyCaptureButton._active_captures += 1
 
     def _on_key(self, widget, event):
+        # Drop autorepeat of a key held through the click (GTK3 re-emits
+        # key-press-event for held keys) for as long as it keeps repeating.
+        # Only repeats of the same key count, so a modifier followed quickly
+        # by the real key (fast Shift+A) still captures the key.
+        hw = event.hardware_keycode
+        last, self._last_evt_time = self._last_evt_time, event.time
+        last_hw, self._last_hw = self._last_hw, hw
+        if event.time - last < CAPTURE_DEBOUNCE_MS and last_hw in (None, hw):
+            return True
+
         if event.keyval == Gdk.KEY_Escape:
             # Abort — restore previous state
             self.evdev = self._prev_evdev
-            self.set_label(self._prev_label)
-            self._stop_capture()
-            self.emit('key-captured', '')
+            with self.freeze_notify():
+                self.set_label(self._prev_label)
+                self._stop_capture()
+            self._emit_captured('')
             return True
 
-        hw = event.hardware_keycode
         evdev = hw_to_evdev(hw)
 
         if not self.allow_trigger_keys and evdev in MODIFIER_EVDEV:
@@ -207,21 +257,33 @@ class KeyCaptureButton(Gtk.Button):
                 if shift and not self.allow_trigger_keys:
                     evdev = f'SHIFT+{evdev}'
             self.evdev = evdev
-            self.set_label(evdev_to_display(evdev))
+            label = evdev_to_display(evdev)
         else:
             self.evdev = None
-            self.set_label(f"? (hw={hw})")
+            label = f"? (hw={hw})"
 
-        self._stop_capture()
-        self.emit('key-captured', self.evdev or '')
+        with self.freeze_notify():
+            self.set_label(label)
+            self._stop_capture()
+        self._emit_captured(self.evdev or '')
         return True
 
+    def connect_captured(self, fn):
+        """Call fn(button, evdev_name) when capture completes or is aborted.
+        evdev_name is e.g. 'KEY_A' or 'SHIFT+KEY_A', or '' if aborted via ESC."""
+        self._captured_listeners.append(fn)
+
+    def _emit_captured(self, value):
+        for fn in self._captured_listeners:
+            fn(self, value)
+
     def _stop_capture(self):
         self.set_sensitive(True)
         if self._handler_id and self._dialog:
             self._dialog.disconnect(self._handler_id)
             self._handler_id = None
             self._dialog = None
+            KeyCaptureButton._active_captures -= 1
 
     def reset(self, placeholder="Click to capture"):
         self._stop_capture()
@@ -229,6 +291,37 @@ class KeyCaptureButton(Gtk.Button):
         self.set_label(placeholder)
 
 
+# Hot-path key codes for SequenceTester.feed_key
+_KEY_ESC       = _ec.KEY_ESC
+_KEY_LEFTSHIFT = _ec.KEY_LEFTSHIFT
+
+
+def _code_display_name(name) -> str:
+    """ecodes.KEY entry -> tester label ('KEY_LEFTALT' -> 'Leftalt').
+    Aliased codes map to a list of names; the first is used."""
+    if isinstance(name, (list, tuple)):
+        name = name[0]
+    return name[4:].title() if name.startswith('KEY_') else name
+
+
+# Key code -> SequenceTester._fmt label
+_CODE_TO_DISPLAY = {code: _code_display_name(name) for code, name in _ec.KEY.items()}
+
+# Punctuation accepted as a compose/target key (same map as daemon)
+_PUNCT_TO_CODE = {
+    ';': _ec.KEY_SEMICOLON,  "'": _ec.KEY_APOSTROPHE, '`': _ec.KEY_GRAVE,
+    ',': _ec.KEY_COMMA,      '.': _ec.KEY_DOT,        '/': _ec.KEY_SLASH,
+    '\\': _ec.KEY_BACKSLASH, '-': _ec.KEY_MINUS,      '=': _ec.KEY_EQUAL,
+    '[': _ec.KEY_LEFTBRACE,  ']': _ec.KEY_RIGHTBRACE,
+}
+
+# Modifier words allowed in 'CTRL+x'-style targets
+_TARGET_MOD_TO_CODE = {
+    'CTRL':  _ec.KEY_LEFTCTRL, 'CONTROL': _ec.KEY_LEFTCTRL,
+    'SHIFT': _ec.KEY_LEFTSHIFT, 'ALT':    _ec.KEY_LEFTALT,
+}
+
+
 class SequenceTester:
     """
     In-process sequence state machine for the test drawer.
@@ -242,9 +335,18 @@ class SequenceTester:
     _META_KEYS   = {125, 126} # KEY_LEFTMETA, KEY_RIGHTMETA
     _ALT_KEYS    = {56, 100}  # KEY_LEFTALT, KEY_RIGHTALT
     _ALL_MODS    = _SHIFT_KEYS | _CTRL_KEYS | _META_KEYS | _ALT_KEYS
+    _CTRL_META_KEYS = _CTRL_KEYS | _META_KEYS
+
+    # Same groups as bitmasks over _pressed (bit n set = key code n held)
+    _SHIFT_MASK     = sum(1 << k for k in _SHIFT_KEYS)
+    _CTRL_META_MASK = sum(1 << k for k in _CTRL_META_KEYS)
+
+    __slots__ = ('_sequences', '_trigger_codes', '_passthrough_codes',
+                 '_valid_compose', '_state', '_trigger', '_compose',
+                 '_compose_shifted', '_pressed')
 
     def __init__(self):
-        self._sequences   = {}        # parsed lookup table: tuple -> output_str
+        self._sequences   = {}        # (compose_shifted, compose, *targets) -> output_str
         self._trigger_codes = set()   # int key codes
         self._passthrough_codes = set()
         self._valid_compose = set()   # compose key codes that have sequences
@@ -252,14 +354,12 @@ class SequenceTester:
         self._trigger     = None
         self._compose     = None
         self._compose_shifted = False
-        self._pressed     = set()
+        self._pressed     = 0         # bitmask of held key codes
 
     # ── Setup ─────────────────────────────────────────────────────────────
 
     def load(self, seq_config: dict, settings: dict):
         """Parse dirty seq_config + settings into lookup table."""
-        import evdev.ecodes as ec
-
         self._sequences.clear()
         self._trigger_codes.clear()
         self._passthrough_codes.clear()
@@ -272,14 +372,14 @@ class SequenceTester:
             trigger_defs = [trigger_defs]
         for tk in trigger_defs:
             try:
-                self._trigger_codes.add(getattr(ec, tk))
+                self._trigger_codes.add(getattr(_ec, tk))
             except AttributeError:
                 pass
 
         # Passthrough keys
         for pk in settings.get('passthrough_keys', []):
             try:
-                self._passthrough_codes.add(getattr(ec, pk))
+                self._passthrough_codes.add(getattr(_ec, pk))
             except AttributeError:
                 pass
 
@@ -306,51 +406,37 @@ class SequenceTester:
                     target_codes = self._parse_target(target_str)
                 except Exception:
                     continue
-                for trigger_code in self._trigger_codes:
-                    lookup = (trigger_code, compose_shifted, compose_code, *target_codes)
-                    self._sequences[lookup] = output
-                    self._valid_compose.add(compose_code)
+                # Every trigger maps the same sequences, so the trigger is not
+                # part of the key; feed_key only gets here after a valid trigger
+                self._sequences[(compose_shifted, compose_code, *target_codes)] = output
+                self._valid_compose.add(compose_code)
 
     def _parse_key(self, s: str) -> int:
-        import evdev.ecodes as ec
         s = s.strip()
-        if s.upper().startswith('KEY_'):
-            return getattr(ec, s.upper())
+        upper = s.upper()
+        if upper.startswith('KEY_'):
+            return getattr(_ec, upper)
         # single char
-        c = s.lower()
-        name = f'KEY_{c.upper()}'
-        if hasattr(ec, name):
-            return getattr(ec, name)
-        # punctuation map (same as daemon)
-        pmap = {';': 'KEY_SEMICOLON', "'": 'KEY_APOSTROPHE', '`': 'KEY_GRAVE',
-                ',': 'KEY_COMMA', '.': 'KEY_DOT', '/': 'KEY_SLASH',
-                '\\': 'KEY_BACKSLASH', '-': 'KEY_MINUS', '=': 'KEY_EQUAL',
-                '[': 'KEY_LEFTBRACE', ']': 'KEY_RIGHTBRACE'}
-        if s in pmap:
-            return getattr(ec, pmap[s])
+        name = f'KEY_{upper}'
+        if hasattr(_ec, name):
+            return getattr(_ec, name)
+        if s in _PUNCT_TO_CODE:
+            return _PUNCT_TO_CODE[s]
         raise ValueError(f"Unknown key: {s!r}")
 
     def _parse_target(self, s: str) -> list:
-        import evdev.ecodes as ec
         s = s.strip()
         # CTRL+x form
         if '+' in s:
-            parts = s.split('+')
             codes = []
-            for p in parts:
+            for p in s.split('+'):
                 p = p.strip()
-                if p.upper() in ('CTRL', 'CONTROL'):
-                    codes.append(ec.KEY_LEFTCTRL)
-                elif p.upper() == 'SHIFT':
-                    codes.append(ec.KEY_LEFTSHIFT)
-                elif p.upper() == 'ALT':
-                    codes.append(ec.KEY_LEFTALT)
-                else:
-                    codes.append(self._parse_key(p))
+                code = _TARGET_MOD_TO_CODE.get(p.upper())
+                codes.append(code if code is not None else self._parse_key(p))
             return codes
         # uppercase single char → add shift
         if len(s) == 1 and s.isupper():
-            return [ec.KEY_LEFTSHIFT, self._parse_key(s)]
+            return [_ec.KEY_LEFTSHIFT, self._parse_key(s)]
         return [self._parse_key(s)]
 
     # ── State machine ──────────────────────────────────────────────────────
@@ -362,149 +448,189 @@ class SequenceTester:
         self._compose_shifted = False
 
     def feed_key(self, key_code: int, value: int) -> dict | None:
-        import evdev.ecodes as ec
-
+        """Feed one key event (value 1=press, 0=release, 2=repeat).
+        Returns None or a new result dict."""
         if value == 1:
-            self._pressed.add(key_code)
+            self._pressed |= 1 << key_code
         elif value == 0:
-            self._pressed.discard(key_code)
+            self._pressed &= ~(1 << key_code)
 
         # Repeats ignored during compose (same as daemon)
         if value == 2 and self._state != 'IDLE':
             return None
 
         # ESC always cancels
-        if key_code == ec.KEY_ESC and value == 1:
+        if key_code == _KEY_ESC and value == 1:
             if self._state != 'IDLE':
                 self._reset_state()
                 return None
             return None
 
-        if self._state == 'IDLE':
-            if value != 1:
-                return None
-            if key_code in self._trigger_codes:
-                other_mods = self._CTRL_KEYS | self._META_KEYS
-                if self._pressed & other_mods - {key_code}:
-                    return {'status': 'passthrough', 'trigger': None, 'compose': None,
-                            'target': None, 'output': None,
-                            'reason': 'Trigger with Ctrl/Meta — regular shortcut'}
-                self._trigger = key_code
-                self._state   = 'TRIGGER_PRESSED'
+        return self._DISPATCH[self._state](self, key_code, value)
+
+    def _feed_idle(self, key_code: int, value: int) -> dict | None:
+        if value != 1:
             return None
+        if key_code in self._trigger_codes:
+            if self._pressed & self._CTRL_META_MASK & ~(1 << key_code):
+                return self._emit('passthrough',
+                                  reason='Trigger with Ctrl/Meta — regular shortcut')
+            self._trigger = key_code
+            self._state   = 'TRIGGER_PRESSED'
+        return None
 
-        elif self._state == 'TRIGGER_PRESSED':
-            if value == 0 and key_code == self._trigger:
+    def _feed_trigger_pressed(self, key_code: int, value: int) -> dict | None:
+        if value == 0 and key_code == self._trigger:
+            self._reset_state()
+            return self._emit('passthrough', self._fmt(self._trigger),
+                              reason='Trigger released alone')
+        if value == 1:
+            if key_code in (self._SHIFT_KEYS):
+                return None  # wait to see compose key
+            if key_code in self._passthrough_codes:
+                res = self._emit('passthrough', self._fmt(self._trigger), self._fmt(key_code),
+                                 reason=f'{self._fmt(key_code)} is in passthrough list')
                 self._reset_state()
-                return {'status': 'passthrough', 'trigger': self._fmt(self._trigger),
-                        'compose': None, 'target': None, 'output': None,
-                        'reason': 'Trigger released alone'}
-            if value == 1:
-                if key_code in (self._SHIFT_KEYS):
-                    return None  # wait to see compose key
-                if key_code in self._passthrough_codes:
-                    res = {'status': 'passthrough',
-                           'trigger': self._fmt(self._trigger),
-                           'compose': self._fmt(key_code),
-                           'target': None, 'output': None,
-                           'reason': f'{self._fmt(key_code)} is in passthrough list'}
-                    self._reset_state()
-                    return res
-                if key_code in self._CTRL_KEYS | self._META_KEYS:
-                    self._reset_state()
-                    return {'status': 'passthrough', 'trigger': self._fmt(self._trigger),
-                            'compose': self._fmt(key_code), 'target': None, 'output': None,
-                            'reason': 'Additional modifier — regular shortcut'}
-                if key_code not in self._valid_compose:
-                    res = {'status': 'passthrough',
-                           'trigger': self._fmt(self._trigger),
-                           'compose': self._fmt(key_code),
-                           'target': None, 'output': None,
-                           'reason': f'{self._fmt(key_code)} has no sequences defined'}
-                    self._reset_state()
-                    return res
-                self._compose = key_code
-                self._compose_shifted = bool(self._pressed & self._SHIFT_KEYS)
-                self._state = 'COMPOSE_PRESSED'
-            return None
+                return res
+            if key_code in self._CTRL_META_KEYS:
+                self._reset_state()
+                return self._emit('passthrough', self._fmt(self._trigger), self._fmt(key_code),
+                                  reason='Additional modifier — regular shortcut')
+            if key_code not in self._valid_compose:
+                res = self._emit('passthrough', self._fmt(self._trigger), self._fmt(key_code),
+                                 reason=f'{self._fmt(key_code)} has no sequences defined')
+                self._reset_state()
+                return res
+            self._compose = key_code
+            self._compose_shifted = bool(self._pressed & self._SHIFT_MASK)
+            self._state = 'COMPOSE_PRESSED'
+        return None
 
-        elif self._state == 'COMPOSE_PRESSED':
-            # Allow trigger key releases through — needed for transition to WAITING_TARGET
-            if key_code in self._ALL_MODS and key_code not in self._trigger_codes:
-                return None
-            if value == 0 and key_code in (self._trigger, self._compose):
-                t_gone = self._trigger not in self._pressed
-                c_gone = self._compose not in self._pressed
-                if t_gone and c_gone:
-                    self._state = 'WAITING_TARGET'
-                    return {'status': 'waiting',
-                            'trigger': self._fmt(self._trigger),
-                            'compose': ('Shift+' if self._compose_shifted else '') + self._fmt(self._compose),
-                            'target': None, 'output': None, 'reason': None}
+    def _feed_compose_pressed(self, key_code: int, value: int) -> dict | None:
+        # Allow trigger key releases through — needed for transition to WAITING_TARGET
+        if key_code in self._ALL_MODS and key_code not in self._trigger_codes:
             return None
+        if value == 0 and key_code in (self._trigger, self._compose):
+            t_gone = not self._pressed & (1 << self._trigger)
+            c_gone = not self._pressed & (1 << self._compose)
+            if t_gone and c_gone:
+                self._state = 'WAITING_TARGET'
+                return self._emit('waiting', self._fmt(self._trigger),
+                                  ('Shift+' if self._compose_shifted else '') + self._fmt(self._compose))
+        return None
 
-        elif self._state == 'WAITING_TARGET':
-            if key_code in self._ALL_MODS:
-                return None
-            if value != 1:
-                return None
-
-            target_shifted = bool(self._pressed & self._SHIFT_KEYS)
-            target_codes   = []
-            if target_shifted:
-                import evdev.ecodes as ec2
-                target_codes.append(ec2.KEY_LEFTSHIFT)
-            target_codes.append(key_code)
+    def _feed_waiting_target(self, key_code: int, value: int) -> dict | None:
+        if key_code in self._ALL_MODS:
+            return None
+        if value != 1:
+            return None
 
-            lookup = (self._trigger, self._compose_shifted, self._compose, *target_codes)
+        target_shifted = bool(self._pressed & self._SHIFT_MASK)
+        target_codes   = []
+        if target_shifted:
+            target_codes.append(_KEY_LEFTSHIFT)
+        target_codes.append(key_code)
 
-            matched_output = self._sequences.get(lookup)
-            if matched_output is None and target_shifted:
-                # Try unshifted fallback
-                import evdev.ecodes as ec2
-                ul = (self._trigger, self._compose_shifted, self._compose, key_code)
-                matched_output = self._sequences.get(ul)
+        lookup = (self._compose_shifted, self._compose, *target_codes)
 
-            trigger_disp = self._fmt(self._trigger)
-            compose_disp = ('Shift+' if self._compose_shifted else '') + self._fmt(self._compose)
-            target_disp  = ('Shift+' if target_shifted else '') + self._fmt(key_code)
+        matched_output = self._sequences.get(lookup)
+        if matched_output is None and target_shifted:
+            # Try unshifted fallback
+            ul = (self._compose_shifted, self._compose, key_code)
+            matched_output = self._sequences.get(ul)
 
-            self._reset_state()
+        trigger_disp = self._fmt(self._trigger)
+        compose_disp = ('Shift+' if self._compose_shifted else '') + self._fmt(self._compose)
+        target_disp  = ('Shift+' if target_shifted else '') + self._fmt(key_code)
 
-            if matched_output is not None:
-                return {'status': 'matched', 'trigger': trigger_disp,
-                        'compose': compose_disp, 'target': target_disp,
-                        'output': matched_output, 'reason': None}
-            else:
-                return {'status': 'no_match', 'trigger': trigger_disp,
-                        'compose': compose_disp, 'target': target_disp,
-                        'output': None, 'reason': 'No sequence matched — passed through'}
+        self._reset_state()
 
-        return None
+        if matched_output is not None:
+            return self._emit('matched', trigger_disp, compose_disp, target_disp,
+                              matched_output)
+        else:
+            return self._emit('no_match', trigger_disp, compose_disp, target_disp,
+                              reason='No sequence matched — passed through')
+
+    def _emit(self, status, trigger=None, compose=None, target=None,
+              output=None, reason=None) -> dict:
+        return {'status': status, 'trigger': trigger, 'compose': compose,
+                'target': target, 'output': output, 'reason': reason}
+
+    # State -> handler; looked up once per key event by feed_key
+    _DISPATCH = {
+        'IDLE':            _feed_idle,
+        'TRIGGER_PRESSED': _feed_trigger_pressed,
+        'COMPOSE_PRESSED': _feed_compose_pressed,
+        'WAITING_TARGET':  _feed_waiting_target,
+    }
 
     def _fmt(self, code: int) -> str:
         """Format a key code as a human-readable string."""
         if code is None:
             return '—'
-        try:
-            import evdev.ecodes as ec
-            name = ec.KEY.get(code, f'KEY_{code}')
-            # Strip KEY_ prefix and title-case
-            if name.startswith('KEY_'):
-                return name[4:].title()
-            return name
-        except Exception:
-            return str(code)
+        return _CODE_TO_DISPLAY.get(code) or str(code)
 
     def in_waiting_state(self) -> bool:
         return self._state == 'WAITING_TARGET'
 
     def reset(self):
         self._reset_state()
-        self._pressed.clear()
+        self._pressed = 0
+
+
+# Column list for SequenceEditorDialog.store insert_with_valuesv calls
+_SEQ_STORE_COLUMNS = [0, 1, 2, 3, 4]
+
+# path -> [(st_mtime_ns, st_size), parsed JSON, validation result]; the
+# validation result is _UNCHECKED until ConfigManager._validate_config runs
+_json_cache = {}
+_UNCHECKED = object()
+
+
+def _json_cache_entry(path):
+    """Cache entry for a JSON file, re-parsed only when its mtime or size
+    changes. Raises OSError / JSONDecodeError like a plain read would."""
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _json_cache.get(str(path))
+    if hit is None or hit[0] != key:
+        with open(path, 'rb') as f:
+            hit = _json_cache[str(path)] = [key, _loads(f.read()), _UNCHECKED]
+    return hit
 
 
-class SequenceEditorDialog(Gtk.Window):
+def _load_json_cached(path):
+    """Parse a JSON file, reusing the last parse while its mtime and size are
+    unchanged. The result is shared: callers must not modify it.
+    Raises OSError / JSONDecodeError like a plain read would."""
+    return _json_cache_entry(path)[1]
+
+# Runs of characters not allowed in a config filename slug
+_SLUG_SEP_RE = re.compile(r'[^a-zA-Z0-9]+')
+
+
+class _StatusMixin:
+    """Status line for a window with self.status_label; transient messages
+    clear themselves after 3 s. Set self._status_timer_id = None in __init__."""
+
+    def _set_status(self, msg, transient=True):
+        self.status_label.set_text(msg)
+        # Keep at most one pending clear; a newer message restarts the countdown
+        if self._status_timer_id is not None:
+            GLib.source_remove(self._status_timer_id)
+            self._status_timer_id = None
+        if transient and msg:
+            self._status_timer_id = GLib.timeout_add_seconds(3, self._clear_status)
+
+    def _clear_status(self):
+        self._status_timer_id = None
+        if self.get_realized():
+            self.status_label.set_text('')
+        return False
+
+
+class SequenceEditorDialog(_StatusMixin, Gtk.Window):
 
     def __init__(self, parent, sequence_config_path, on_saved=None):
         super().__init__(title="Edit Sequence", transient_for=parent, modal=True)
@@ -514,6 +640,8 @@ class SequenceEditorDialog(Gtk.Window):
         self._saved_callback = on_saved or (lambda: None)
         self.connect('delete-event', self._on_delete_event)
         self.connect('key-press-event', self._on_key_press)
+        # Stays connected; _on_key_release ignores events unless testing
+        self.connect('key-release-event', self._on_key_release)
         self.connect('destroy', lambda _: TEST_MODE_FILE.unlink(missing_ok=True))
 
         self.seq_path   = Path(sequence_config_path) if sequence_config_path else None
@@ -546,6 +674,8 @@ class SequenceEditorDialog(Gtk.Window):
         # ── Test drawer (hidden until Test button toggled) ─────────────────
         self._tester      = SequenceTester()
         self._test_active = False
+        self._grab_retry_id = None
+        self._grab_retries = 0
 
         self._test_revealer = Gtk.Revealer()
         self._test_revealer.set_transition_type(Gtk.RevealerTransitionType.SLIDE_DOWN)
@@ -591,6 +721,9 @@ class SequenceEditorDialog(Gtk.Window):
         self._t_output  = _ro_entry()
         self._t_output.set_width_chars(24)
         result_grid.attach(self._t_output,  1, 3, 1, 1)
+        # Result CSS class currently applied to each field (None = plain)
+        self._t_classes = {w: None for w in (self._t_trigger, self._t_compose,
+                                             self._t_target, self._t_output)}
 
         test_box.pack_start(result_grid, False, False, 0)
 
@@ -646,6 +779,7 @@ class SequenceEditorDialog(Gtk.Window):
         scroll.set_min_content_height(150)
 
         self.store = Gtk.ListStore(str, str, str, str, str)  # disp_compose, disp_target, output, raw_compose, raw_target
+        self._row_iters = {}  # (raw_compose, raw_target) -> store iter
         self.tree  = Gtk.TreeView(model=self.store)
         self.tree.set_headers_visible(True)
         for i, title in enumerate(["Compose Key", "Target", "Output"]):
@@ -690,6 +824,7 @@ class SequenceEditorDialog(Gtk.Window):
         form_vbox.pack_start(grid, False, False, 0)
 
         self.status_label = Gtk.Label(label="", xalign=0)
+        self._status_timer_id = None
         form_vbox.pack_start(self.status_label, False, False, 0)
 
         btn_row = Gtk.Box(spacing=6)
@@ -705,15 +840,21 @@ class SequenceEditorDialog(Gtk.Window):
 
         self._refresh_list()
         self.show_all()
-        self._orig_snapshot = self._snapshot()
+        # Dirty tracking: meta fields compared directly, sequences via a key
+        # refreshed only when the sequences dict is mutated (_on_add/_on_delete)
+        self._orig_name      = self.name_entry.get_text()
+        self._orig_desc      = self.desc_entry.get_text()
+        self._seq_state      = self._seq_key()
+        self._orig_seq_state = self._seq_state
         self._saved = False
 
     # ── Helpers ───────────────────────────────────────────────────────────
 
     def _load_json(self, path, default):
+        """Parse a JSON file via the shared parse cache.
+        Returns a private copy: callers edit the result in place."""
         try:
-            with open(path) as f:
-                return json.load(f)
+            return copy.deepcopy(_load_json_cached(path))
         except Exception:
             return default
 
@@ -727,10 +868,8 @@ class SequenceEditorDialog(Gtk.Window):
             return True
         # Route to tester when drawer is open (and no capture dialog is active)
         if self._test_active and not self._any_capture_active():
-            hw = event.hardware_keycode
-            import evdev.ecodes as ec
             # hardware_keycode in GTK is evdev code + 8
-            evdev_code = hw - 8
+            evdev_code = event.hardware_keycode - 8
             result = self._tester.feed_key(evdev_code, 1)
             if result:
                 self._test_show(result)
@@ -762,7 +901,7 @@ class SequenceEditorDialog(Gtk.Window):
         return self._any_capture_active()
 
     def _any_capture_active(self):
-        return _any_capture_active([self.btn_compose, self.btn_target])
+        return _any_capture_active()
 
     # ── Test drawer ───────────────────────────────────────────────────────
 
@@ -786,21 +925,37 @@ class SequenceEditorDialog(Gtk.Window):
             pass
         # Freeze editor controls
         self._set_editor_sensitive(False)
-        # Connect key-release
-        self._key_release_handler = self.connect('key-release-event', self._on_key_release)
         self._test_revealer.set_reveal_child(True)
         self._test_clear()
         self._t_status.set_text("🔒 Keyboard captured — type a sequence")
         # Hard X11 keyboard grab so this window receives all key events
         self.present()
+        if not self._try_grab():
+            # The compositor may not have mapped the window yet; retry briefly
+            self._grab_retries = GRAB_RETRIES
+            self._grab_retry_id = GLib.timeout_add(GRAB_RETRY_MS, self._retry_grab)
+
+    def _try_grab(self):
         gdkwin = self.get_window()
-        if gdkwin:
-            result = Gdk.keyboard_grab(gdkwin, True, Gdk.CURRENT_TIME)
-            if result != Gdk.GrabStatus.SUCCESS:
-                self._t_status.set_text("⚠ Could not grab keyboard — click here first, then type")
+        return bool(gdkwin) and Gdk.keyboard_grab(
+            gdkwin, True, Gdk.CURRENT_TIME) == Gdk.GrabStatus.SUCCESS
+
+    def _retry_grab(self):
+        if self._try_grab():
+            self._grab_retry_id = None
+            return False
+        self._grab_retries -= 1
+        if self._grab_retries > 0:
+            return True
+        self._grab_retry_id = None
+        self._t_status.set_text("⚠ Could not grab keyboard — click here first, then type")
+        return False
 
     def _stop_test(self):
         self._test_active = False
+        if self._grab_retry_id is not None:
+            GLib.source_remove(self._grab_retry_id)
+            self._grab_retry_id = None
         # Release X11 keyboard grab
         Gdk.keyboard_ungrab(Gdk.CURRENT_TIME)
         # Remove flag file
@@ -808,12 +963,6 @@ class SequenceEditorDialog(Gtk.Window):
             TEST_MODE_FILE.unlink(missing_ok=True)
         except Exception:
             pass
-        # Disconnect key-release
-        if hasattr(self, '_key_release_handler'):
-            try:
-                self.disconnect(self._key_release_handler)
-            except Exception:
-                pass
         self._tester.reset()
         self._set_editor_sensitive(True)
         self._test_revealer.set_reveal_child(False)
@@ -832,9 +981,20 @@ class SequenceEditorDialog(Gtk.Window):
             w.set_text('')
         self._t_status.set_text("🔒 Keyboard captured — type a sequence")
         # Remove any coloring
-        for w in (self._t_trigger, self._t_compose, self._t_target, self._t_output):
-            w.get_style_context().remove_class('test-matched')
-            w.get_style_context().remove_class('test-nomatch')
+        for w in self._t_classes:
+            self._test_set_class(w, None)
+
+    def _test_set_class(self, w, css_class):
+        """Swap w's result class, touching the style context only on change."""
+        old = self._t_classes[w]
+        if old == css_class:
+            return
+        sc = w.get_style_context()
+        if old:
+            sc.remove_class(old)
+        if css_class:
+            sc.add_class(css_class)
+        self._t_classes[w] = css_class
 
     def _test_show(self, result: dict):
         self._t_trigger.set_text(result.get('trigger') or '')
@@ -845,23 +1005,17 @@ class SequenceEditorDialog(Gtk.Window):
         status = result.get('status')
         reason = result.get('reason') or ''
 
-        css_matched  = 'test-matched'
-        css_nomatch  = 'test-nomatch'
-
-        for w in (self._t_trigger, self._t_compose, self._t_target, self._t_output):
-            sc = w.get_style_context()
-            sc.remove_class(css_matched)
-            sc.remove_class(css_nomatch)
+        # Only the output (matched) and target (no match) fields get colored
+        self._test_set_class(self._t_output,
+                             'test-matched' if status == 'matched' else None)
+        self._test_set_class(self._t_target,
+                             'test-nomatch' if status == 'no_match' else None)
 
         if status == 'waiting':
             self._t_status.set_text("⌨ Waiting for target key…")
         elif status == 'matched':
-            for w in (self._t_output,):
-                w.get_style_context().add_class(css_matched)
             self._t_status.set_text(f"✓ Matched → {result.get('output')}")
         elif status == 'no_match':
-            for w in (self._t_target,):
-                w.get_style_context().add_class(css_nomatch)
             self._t_status.set_text(f"↷ Passed through — {reason}")
         elif status == 'passthrough':
             self._t_status.set_text(f"↷ Passed through — {reason}")
@@ -870,28 +1024,46 @@ class SequenceEditorDialog(Gtk.Window):
 
     # ── Sequences ─────────────────────────────────────────────────────────
 
-    def _refresh_list(self):
-        self.store.clear()
+    def _list_rows(self):
+        """Flatten seq_config into store rows, in config order."""
+        rows = []
         for compose_key, targets in self.seq_config.get('sequences', {}).items():
             if isinstance(targets, dict):
                 for target, output in targets.items():
-                    self.store.append([evdev_to_display(compose_key),
-                                       evdev_to_display(target),
-                                       str(output),
-                                       compose_key, target])
+                    rows.append([evdev_to_display(compose_key),
+                                 evdev_to_display(target),
+                                 str(output),
+                                 compose_key, target])
             elif isinstance(targets, str):
-                self.store.append([evdev_to_display(compose_key), '→ alias', targets,
-                                   compose_key, ''])
+                rows.append([evdev_to_display(compose_key), '→ alias', targets,
+                             compose_key, ''])
+        return rows
+
+    def _refresh_list(self):
+        """(Re)load the store from seq_config. Used for the initial fill;
+        add/delete update single rows through self._row_iters, which maps
+        (raw_compose, raw_target) to the row's iter (ListStore iters stay
+        valid across inserts and other removals)."""
+        # Detach the model so the view doesn't react to every row-inserted
+        self.tree.set_model(None)
+        self.store.clear()
+        self._row_iters.clear()
+        for pos, row in enumerate(self._list_rows()):
+            self._row_iters[(row[3], row[4])] = self.store.insert_with_valuesv(
+                pos, _SEQ_STORE_COLUMNS, row)
+        self.tree.set_model(self.store)
 
     def _on_sel_changed(self, selection):
         model, it = selection.get_selected()
         self.btn_delete.set_sensitive(it is not None)
         if it:
-            self.btn_compose.evdev = model[it][3]
-            self.btn_compose.set_label(model[it][0])
-            self.btn_target.evdev = model[it][4]
-            self.btn_target.set_label(model[it][1])
-            self.output_entry.set_text(model[it][2])
+            compose_disp, target_disp, output, compose, target = \
+                model.get(it, *_SEQ_STORE_COLUMNS)
+            self.btn_compose.evdev = compose
+            self.btn_compose.set_label(compose_disp)
+            self.btn_target.evdev = target
+            self.btn_target.set_label(target_disp)
+            self.output_entry.set_text(output)
             self.btn_add.set_label("Save")
             self._set_status("Editing selected row — update values and click Save")
         else:
@@ -901,14 +1073,15 @@ class SequenceEditorDialog(Gtk.Window):
         _, it = self.tree.get_selection().get_selected()
         if not it:
             return
-        compose_key = self.store[it][3]
-        target      = self.store[it][4]
+        compose_key, target = self.store.get(it, 3, 4)
         seqs = self.seq_config.setdefault('sequences', {})
         if compose_key in seqs and isinstance(seqs[compose_key], dict):
             seqs[compose_key].pop(target, None)
             if not seqs[compose_key]:
                 del seqs[compose_key]
-        self._refresh_list()
+            self._row_iters.pop((compose_key, target), None)
+            self.store.remove(it)
+        self._seq_state = self._seq_key()
         self._reset_form()
         self._set_status("Deleted.")
         self._on_state_changed()
@@ -928,20 +1101,38 @@ class SequenceEditorDialog(Gtk.Window):
             self._set_status("⚠ Enter an output value")
             return
 
-        # If editing an existing row, remove the old entry first
+        # If editing an existing row, remove the old entry first; the row
+        # itself is reused for the new values below
         _, it = self.tree.get_selection().get_selected()
+        edit_it = None
         if it:
-            old_compose = self.store[it][3]
-            old_target  = self.store[it][4]
+            old_compose, old_target = self.store.get(it, 3, 4)
             seqs = self.seq_config.setdefault('sequences', {})
             if old_compose in seqs and isinstance(seqs[old_compose], dict):
                 seqs[old_compose].pop(old_target, None)
                 if not seqs[old_compose]:
                     del seqs[old_compose]
+                edit_it = self._row_iters.pop((old_compose, old_target), it)
 
         target_cfg = evdev_to_target(target)
         self.seq_config.setdefault('sequences', {}).setdefault(compose, {})[target_cfg] = output
-        self._refresh_list()
+        self._seq_state = self._seq_key()
+
+        row = [evdev_to_display(compose), evdev_to_display(target_cfg),
+               output, compose, target_cfg]
+        key = (compose, target_cfg)
+        cur = self._row_iters.get(key)
+        if cur is not None:
+            # Overwrote an existing sequence: update its row, drop the edited one
+            self.store.set_value(cur, 2, output)
+            if edit_it is not None:
+                self.store.remove(edit_it)
+        elif edit_it is not None:
+            self.store.set(edit_it, _SEQ_STORE_COLUMNS, row)
+            self._row_iters[key] = edit_it
+        else:
+            self._row_iters[key] = self.store.insert_with_valuesv(
+                -1, _SEQ_STORE_COLUMNS, row)
         self._set_status(f"✓ Added: {compose} + {target_cfg} → {output}")
         self._reset_form()
         self._on_state_changed()
@@ -954,18 +1145,11 @@ class SequenceEditorDialog(Gtk.Window):
         self.btn_add.set_label("Add to List")
         self.tree.get_selection().unselect_all()
 
-    def _set_status(self, msg, transient=True):
-        self.status_label.set_text(msg)
-        if transient and msg:
-            GLib.timeout_add_seconds(3, lambda: self.get_realized() and
-                                     (self.status_label.set_text('') or False))
-
-    def _snapshot(self):
-        return json.dumps({
-            'name': self.name_entry.get_text(),
-            'description': self.desc_entry.get_text(),
-            'sequences': self.seq_config.get('sequences', {})
-        }, sort_keys=True)
+    def _seq_key(self):
+        """Canonical, order-independent form of the sequences for comparison."""
+        return tuple(sorted(
+            (k, tuple(sorted(v.items())) if isinstance(v, dict) else v)
+            for k, v in self.seq_config.get('sequences', {}).items()))
 
     def _on_save_clicked(self, _):
         ok, err = self.save()
@@ -982,7 +1166,10 @@ class SequenceEditorDialog(Gtk.Window):
             dlg.destroy()
 
     def _on_state_changed(self, *_):
-        self.btn_save.set_sensitive(self._snapshot() != self._orig_snapshot)
+        dirty = (self.name_entry.get_text() != self._orig_name
+                 or self.desc_entry.get_text() != self._orig_desc
+                 or self._seq_state != self._orig_seq_state)
+        self.btn_save.set_sensitive(dirty)
 
     def save(self):
         name = self.name_entry.get_text().strip()
@@ -991,7 +1178,7 @@ class SequenceEditorDialog(Gtk.Window):
         self.seq_config['name'] = name
         self.seq_config['description'] = self.desc_entry.get_text().strip()
 
-        slug = re.sub(r'[^a-zA-Z0-9]+', '-', name).strip('-').lower()
+        slug = _SLUG_SEP_RE.sub('-', name).strip('-').lower()
         if not slug:
             return False, "Name produces an empty filename"
 
@@ -1002,9 +1189,11 @@ class SequenceEditorDialog(Gtk.Window):
         if new_path.exists() and new_path != self.seq_path:
             return False, f"A config named '{slug}.config.json' already exists.\nChoose a different name."
 
+        # Atomic so the daemon never reads a torn config (the .json.tmp
+        # temp file stays out of *.config.json)
         try:
-            with open(new_path, 'w') as f:
-                json.dump(self.seq_config, f, indent=2, ensure_ascii=False)
+            atomic_write(new_path, _dumps(self.seq_config))
+            _json_cache.pop(str(new_path), None)
             # Rename old file if path changed
             if self.seq_path and self.seq_path.exists() and new_path != self.seq_path:
                 self.seq_path.unlink()
@@ -1021,28 +1210,82 @@ class SequenceEditorDialog(Gtk.Window):
 LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR']
 TIMEOUT_MIN = 200
 TIMEOUT_MAX = 1500
+SAVE_DEBOUNCE_MS = 150   # enabled_sequences write delay after toggles/moves
+
+
+# Scanned once per process; directory monitors drop the cache when icons change
+_icon_sets_cache = None
+_icon_dir_monitors = []
+
+
+def _invalidate_icon_sets(*_):
+    global _icon_sets_cache
+    _icon_sets_cache = None
+
+
+def _watch_icon_dirs():
+    for d in (SYSTEM_ICON_DIR, USER_ICON_DIR):
+        try:
+            mon = Gio.File.new_for_path(str(d)).monitor_directory(
+                Gio.FileMonitorFlags.NONE, None)
+        except GLib.Error:
+            continue
+        mon.connect('changed', _invalidate_icon_sets)
+        _icon_dir_monitors.append(mon)
 
 
 def get_icon_sets():
     """Return dict of icon set name -> {active: path, inactive: path, error: path}"""
+    global _icon_sets_cache
+    if _icon_sets_cache is not None:
+        return _icon_sets_cache
+    if not _icon_dir_monitors:
+        _watch_icon_dirs()
     sets = {}
     for d in [SYSTEM_ICON_DIR, USER_ICON_DIR]:
-        if not d.exists():
+        # One directory listing per dir; bucket <name>.<state>.png by name
+        found = {}
+        try:
+            for p in d.iterdir():
+                if not p.name.endswith('.png'):
+                    continue
+                name, _, state = p.name[:-4].rpartition('.')
+                if name and state in ('active', 'inactive', 'error'):
+                    found.setdefault(name, {})[state] = str(p)
+        except OSError:
             continue
-        for p in sorted(d.glob('*.active.png')):
-            name = p.stem.replace('.active', '')
-            inactive = p.parent / f'{name}.inactive.png'
-            error    = p.parent / f'{name}.error.png'
+        for name in sorted(found):
+            files = found[name]
+            if 'active' not in files:
+                continue
             sets[name] = {
-                'active':   str(p),
-                'inactive': str(inactive) if inactive.exists() else str(p),
-                'error':    str(error) if error.exists() else '',
+                'active':   files['active'],
+                'inactive': files.get('inactive', files['active']),
+                'error':    files.get('error', ''),
             }
+    _icon_sets_cache = sets
     return sets
 
 
 
-class ConfigManager(Gtk.Window):
+def _find_applet_pids():
+    """PIDs whose command line mentions umlaut_applet (like pgrep -f),
+    read straight from /proc instead of spawning pgrep."""
+    pids = []
+    with os.scandir('/proc') as it:
+        for e in it:
+            if not e.name.isdigit():
+                continue
+            try:
+                with open(f'/proc/{e.name}/cmdline', 'rb') as f:
+                    if b'umlaut_applet' in f.read():
+                        pids.append(int(e.name))
+            except OSError:
+                continue  # exited meanwhile, or not ours to read
+    return pids
+
+
+class ConfigManager(_StatusMixin, Gtk.Window):
 
     def __init__(self):
         super().__init__(title="Umlaut Config Manager")
@@ -1054,9 +1297,16 @@ class ConfigManager(Gtk.Window):
 
         USER_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
         self.enabled_configs = []
+        self._config_paths = {}    # name -> path, sorted; see _refresh_list
+        self._config_dir_mtime = None
+        self._save_timer_id = None
+        self.connect('destroy', self._flush_save)
+        # Settings as last loaded or saved here; seeds the widgets and the
+        # saved-state dirty snapshot. Writes re-read the file before merging.
+        self._settings = load_settings()
         self._load_enabled()
 
-        overrides = load_settings()
+        overrides = self._settings
         self._settings_valid = SETTINGS_PATH.exists() and bool(overrides)
         settings = overrides.get('settings', {})
         self._pending_timeout = settings.get('timeout_ms', 1000)
@@ -1074,14 +1324,10 @@ class ConfigManager(Gtk.Window):
             GLib.idle_add(lambda: self._set_status(
                 "⚠ Settings file missing — showing defaults. Click 'Create Settings' to save.", transient=False) or False)
 
-        # Dirty tracking — snapshot disk state, wire up all widgets
+        # Dirty tracking — snapshot disk state; settings widgets are wired in
+        # _ensure_settings_tab once they exist
         self._disk_snapshot = self._snapshot(from_disk=True)
-        self.timeout_spin.connect('value-changed', self._check_dirty)
-        self.ll_combo.connect('changed', self._check_dirty)
-        self.icon_combo.connect('changed', self._check_dirty)
-        self.trigger_both_check.connect('toggled', self._check_dirty)
-        self.btn_trigger.connect('key-captured', self._check_dirty)
-        self._passthrough_capture_btn.connect('key-captured', self._check_dirty)
+        self._dirty_check_scheduled = False
 
     def _on_key_press(self, widget, event):
         ctrl = bool(event.state & Gdk.ModifierType.CONTROL_MASK)
@@ -1101,46 +1347,49 @@ class ConfigManager(Gtk.Window):
         return False
 
     def _any_capture_active(self):
-        return _any_capture_active([self.btn_trigger, self._passthrough_capture_btn])
-
-    def _set_status(self, msg, transient=True):
-        self.status_label.set_text(msg)
-        if transient and msg:
-            GLib.timeout_add_seconds(3, lambda: self.get_realized() and
-                                     (self.status_label.set_text('') or False))
+        return _any_capture_active()
 
     def _snapshot(self, from_disk=False):
         """Snapshot settings for dirty-checking.
-        source='disk' reads saved state; source='ui' reads current widget state.
+        from_disk=True uses the saved state; otherwise reads current widget state.
+        Returned as a plain tuple so comparisons need no serialization.
         """
         if from_disk:
-            s = load_settings()
-            return json.dumps({
-                'enabled_sequences': sorted(self.enabled_configs),
-                'timeout_ms':       s.get('settings', {}).get('timeout_ms', 1000),
-                'log_level':        s.get('settings', {}).get('log_level', 'INFO'),
-                'passthrough_keys': s.get('passthrough_keys', []),
-                'trigger_key':      s.get('trigger_key', []),
-                'icon_set':         s.get('icon_set', 'default'),
-            }, sort_keys=True)
-        else:
-            return json.dumps({
-                'enabled_sequences': sorted(self.enabled_configs),
-                'timeout_ms':       int(self.timeout_spin.get_value()),
-                'log_level':        self.ll_combo.get_active_text() or '',
-                'passthrough_keys': self._pending_passthrough_keys,
-                'trigger_key':      self._get_trigger_key_list(),
-                'icon_set':         self.icon_combo.get_active_text() or '',
-            }, sort_keys=True)
+            s = self._settings
+            settings = s.get('settings', {})
+            return (sorted(self.enabled_configs),
+                    settings.get('timeout_ms', 1000),
+                    settings.get('log_level', 'INFO'),
+                    list(s.get('passthrough_keys', [])),
+                    s.get('trigger_key', []),
+                    s.get('icon_set', 'default'))
+        return (sorted(self.enabled_configs),
+                int(self.timeout_spin.get_value()),
+                self.ll_combo.get_active_text() or '',
+                list(self._pending_passthrough_keys),
+                self._get_trigger_key_list(),
+                self.icon_combo.get_active_text() or '')
 
     def _on_tab_switched(self, notebook, page, page_num):
         on_settings = (page_num == 1)
         self.btn_apply.set_visible(on_settings)
         if on_settings:
+            self._ensure_settings_tab()
             if not SETTINGS_PATH.exists():
                 self._set_status("⚠ Settings file missing — showing defaults. Click 'Create Settings' to save.", transient=False)
             self._check_dirty()
 
+    def _schedule_check_dirty(self, *_):
+        # Widget signals can fire several times per user action; compare once
+        if not self._dirty_check_scheduled:
+            self._dirty_check_scheduled = True
+            GLib.idle_add(self._flush_check_dirty)
+
+    def _flush_check_dirty(self):
+        self._dirty_check_scheduled = False
+        self._check_dirty()
+        return False
+
     def _check_dirty(self, *_):
         if not self._settings_valid:
             self.btn_apply.set_label("Create Settings")
@@ -1148,16 +1397,39 @@ class ConfigManager(Gtk.Window):
             return
         if self.btn_apply.get_label() == "Create Settings":
             self.btn_apply.set_label("Apply Changes")
+        if not self._settings_built:
+            return  # re-checked when the Settings tab is first shown
         self.btn_apply.set_sensitive(self._snapshot() != self._disk_snapshot)
 
     def _load_enabled(self):
-        self.enabled_configs = list(load_settings().get('enabled_sequences', []))
+        self.enabled_configs = list(self._settings.get('enabled_sequences', []))
+
+    def _schedule_save(self):
+        """Persist enabled_configs shortly, folding bursts of toggles/moves
+        into one write. Paths that restart the daemon call _save_enabled."""
+        if self._save_timer_id is None:
+            self._save_timer_id = GLib.timeout_add(SAVE_DEBOUNCE_MS, self._on_save_timer)
+
+    def _on_save_timer(self):
+        self._save_timer_id = None
+        self._save_enabled()
+        return False
+
+    def _flush_save(self, *_):
+        if self._save_timer_id is not None:
+            self._save_enabled()
 
     def _save_enabled(self):
+        if self._save_timer_id is not None:
+            GLib.source_remove(self._save_timer_id)
+            self._save_timer_id = None
         try:
+            # Merge into the file's current contents: `umlaut config-enable`
+            # and `config-disable` write it too, and must not be reverted
             s = load_settings()
-            s['enabled_sequences'] = self.enabled_configs
+            s['enabled_sequences'] = list(self.enabled_configs)
             save_settings(s)
+            self._settings = s
             return True
         except Exception as e:
             self._error(f"Failed to save enabled_sequences: {e}")
@@ -1169,7 +1441,10 @@ class ConfigManager(Gtk.Window):
         self.notebook = Gtk.Notebook()
         outer.pack_start(self.notebook, True, True, 0)
         self.notebook.append_page(self._build_sequences_tab(), Gtk.Label(label="Sequences"))
-        self.notebook.append_page(self._build_settings_tab(), Gtk.Label(label="Settings"))
+        # Settings widgets (and the icon scan) are built on first switch
+        self._settings_page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        self._settings_built = False
+        self.notebook.append_page(self._settings_page, Gtk.Label(label="Settings"))
         self.notebook.connect('switch-page', self._on_tab_switched)
         outer.pack_start(self._build_button_row(), False, False, 0)
 
@@ -1233,6 +1508,20 @@ class ConfigManager(Gtk.Window):
 
         return vbox
 
+    def _ensure_settings_tab(self):
+        if self._settings_built:
+            return
+        self._settings_built = True
+        self._settings_page.pack_start(self._build_settings_tab(), True, True, 0)
+        self._settings_page.show_all()
+        # Wire dirty tracking for the settings widgets
+        self.timeout_spin.connect('value-changed', self._schedule_check_dirty)
+        self.ll_combo.connect('changed', self._schedule_check_dirty)
+        self.icon_combo.connect('changed', self._schedule_check_dirty)
+        self.trigger_both_check.connect('toggled', self._schedule_check_dirty)
+        self.btn_trigger.connect_captured(self._schedule_check_dirty)
+        self._passthrough_capture_btn.connect_captured(self._schedule_check_dirty)
+
     def _build_settings_tab(self):
         vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
         vbox.set_border_width(12)
@@ -1249,7 +1538,7 @@ class ConfigManager(Gtk.Window):
         self.btn_trigger = KeyCaptureButton(label=evdev_to_display(initial_trigger),
                                             allow_trigger_keys=True, allow_shift=False)
         self.btn_trigger.evdev = initial_trigger
-        self.btn_trigger.connect('key-captured', self._on_trigger_captured)
+        self.btn_trigger.connect_captured(self._on_trigger_captured)
         trigger_box.pack_start(self.btn_trigger, False, False, 0)
         self.trigger_both_check = Gtk.CheckButton(label="Both (L + R)")
         self.trigger_both_check.set_tooltip_text("Only available for trigger keys (Alt, Ctrl, Shift, Super)")
@@ -1290,6 +1579,7 @@ class ConfigManager(Gtk.Window):
         btn_row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
         btn_row.set_border_width(6)
         self.status_label = Gtk.Label(label="", xalign=0)
+        self._status_timer_id = None
         self.status_label.set_hexpand(True)
         self.status_label.set_ellipsize(Pango.EllipsizeMode.END)
         btn_row.pack_start(self.status_label, True, True, 0)
@@ -1311,7 +1601,7 @@ class ConfigManager(Gtk.Window):
             self.trigger_both_check.set_sensitive(has_pair)
             if not has_pair:
                 self.trigger_both_check.set_active(False)
-        self._check_dirty()
+        self._schedule_check_dirty()
 
     def _get_trigger_key_list(self):
         evdev = self.btn_trigger.evdev
@@ -1343,6 +1633,9 @@ class ConfigManager(Gtk.Window):
         scroll.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
         scroll.set_size_request(-1, 70)
         self.passthrough_store = Gtk.ListStore(str, str)  # evdev_name, display_name
+        # Populate from pending state before a view is attached
+        for k in self._pending_passthrough_keys:
+            self.passthrough_store.insert_with_valuesv(-1, [0, 1], [k, evdev_to_display(k)])
         self.passthrough_tree = Gtk.TreeView(model=self.passthrough_store)
         self.passthrough_tree.set_headers_visible(False)
         col = Gtk.TreeViewColumn("Key", Gtk.CellRendererText(), text=1)
@@ -1350,10 +1643,6 @@ class ConfigManager(Gtk.Window):
         scroll.add(self.passthrough_tree)
         hbox.pack_start(scroll, True, True, 0)
 
-        # Populate from pending state
-        for k in self._pending_passthrough_keys:
-            self.passthrough_store.append([k, evdev_to_display(k)])
-
         # Add / Remove buttons
         btn_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=4)
         btn_box.set_valign(Gtk.Align.CENTER)
@@ -1361,7 +1650,7 @@ class ConfigManager(Gtk.Window):
 
         self._passthrough_capture_btn = KeyCaptureButton(
             label="Add key…", allow_trigger_keys=False, allow_shift=False)
-        self._passthrough_capture_btn.connect('key-captured', self._on_passthrough_captured)
+        self._passthrough_capture_btn.connect_captured(self._on_passthrough_captured)
         btn_box.pack_start(self._passthrough_capture_btn, False, False, 0)
 
         btn_remove = Gtk.Button(label="Remove")
@@ -1372,7 +1661,7 @@ class ConfigManager(Gtk.Window):
         if evdev and evdev not in self._pending_passthrough_keys:
             self._pending_passthrough_keys.append(evdev)
             self.passthrough_store.append([evdev, evdev_to_display(evdev)])
-            self._check_dirty()
+            self._schedule_check_dirty()
         btn.reset("Add key…")
 
     def _on_passthrough_remove(self, _):
@@ -1382,7 +1671,7 @@ class ConfigManager(Gtk.Window):
         evdev = model[it][0]
         self._pending_passthrough_keys = [k for k in self._pending_passthrough_keys if k != evdev]
         model.remove(it)
-        self._check_dirty()
+        self._schedule_check_dirty()
 
     def _build_icon_picker(self, vbox):
         icon_row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
@@ -1391,7 +1680,7 @@ class ConfigManager(Gtk.Window):
 
         self.icon_combo = Gtk.ComboBoxText()
         self.icon_sets  = get_icon_sets()
-        current_set     = load_settings().get('icon_set', 'default').lower()
+        current_set     = self._settings.get('icon_set', 'default').lower()
 
         active_idx = 0
         for i, name in enumerate(sorted(self.icon_sets.keys())):
@@ -1447,67 +1736,91 @@ class ConfigManager(Gtk.Window):
         elif self.status_label.get_text().startswith("⚠ Settings file missing"):
             self._set_status("")
 
-        configs = []
-        if USER_CONFIG_DIR.exists():
-            for p in sorted(USER_CONFIG_DIR.glob('*.config.json')):
-                if p.name != 'settings.config.json':
-                    configs.append(p)
-
-        existing = {p.stem.replace('.config', '') for p in configs}
+        # One directory listing, filtered by name; name -> path is kept so
+        # _config_path can answer without another stat(). Reused as long as
+        # the directory's mtime (bumped by any create/rename/delete) holds.
+        try:
+            dir_mtime = os.stat(USER_CONFIG_DIR).st_mtime_ns
+        except OSError:
+            dir_mtime = None
+        if dir_mtime is None or dir_mtime != self._config_dir_mtime:
+            paths = {}
+            try:
+                with os.scandir(USER_CONFIG_DIR) as it:
+                    for e in it:
+                        if e.name.endswith('.config.json') and e.name != 'settings.config.json':
+                            paths[e.name[:-len('.config.json')]] = Path(e.path)
+            except OSError:
+                pass
+            self._config_paths = dict(sorted(paths.items()))
+            self._config_dir_mtime = dir_mtime
 
-        cleaned = [c for c in self.enabled_configs if c in existing]
+        cleaned = [c for c in self.enabled_configs if c in self._config_paths]
         if cleaned != self.enabled_configs:
             self.enabled_configs = cleaned
             self._save_enabled()
 
-        for path in configs:
-            name = path.stem.replace('.config', '')
-            enabled = name in self.enabled_configs
+        enabled_set = set(self.enabled_configs)
+        for name, path in self._config_paths.items():
+            enabled = name in enabled_set
             display = name
             desc = ''
             try:
-                with open(path) as f:
-                    cfg = json.load(f)
-                    display = cfg.get('name', name)
-                    desc = cfg.get('description', '')
+                cfg = _load_json_cached(path)
+                display = cfg.get('name', name)
+                desc = cfg.get('description', '')
             except Exception:
                 pass
             self.store.append([enabled, display, desc, name, 'user'])
 
+        self._show_enabled_count()
+
+    def _show_enabled_count(self):
         n = len(self.enabled_configs)
-        t = len(configs)
+        t = len(self._config_paths)
         self.status_label.set_text(f"{n} of {t} configs enabled")
 
     def _selected(self):
         return self.tree.get_selection().get_selected()
 
     def _config_path(self, name):
-        p = USER_CONFIG_DIR / f"{name}.config.json"
-        return p if p.exists() else None
+        """Path of config name if it exists, else None. The cached listing
+        can be stale (a file removed or renamed outside the app, or a change
+        within one mtime tick), so the path is checked here; a miss forces
+        the next _refresh_list to rescan the directory."""
+        path = self._config_paths.get(name) or USER_CONFIG_DIR / f"{name}.config.json"
+        if path.exists():
+            return path
+        self._config_dir_mtime = None
+        return None
 
     def _on_toggled(self, widget, path):
         it = self.store.get_iter(path)
-        name = self.store[it][3]
-        new_state = not self.store[it][0]
+        name, enabled = self.store.get(it, 3, 0)
+        new_state = not enabled
 
         if new_state:
             cfg_path = self._config_path(name)
-            if cfg_path:
-                err = self._validate_config(cfg_path)
-                if err:
-                    self._error(f"Cannot enable '{name}':\n{err}")
-                    return
+            if not cfg_path:
+                self._error("Config file not found")
+                self._refresh_list()
+                return
+            err = self._validate_config(cfg_path)
+            if err:
+                self._error(f"Cannot enable '{name}':\n{err}")
+                return
 
-        self.store[it][0] = new_state
+        self.store.set_value(it, 0, new_state)
         if new_state:
             if name not in self.enabled_configs:
                 self.enabled_configs.append(name)
         else:
             self.enabled_configs = [c for c in self.enabled_configs if c != name]
 
-        self._save_enabled()
-        self._refresh_list()
-        self._check_dirty()
+        # Only the checkbox column changed; no need to rescan the directory
+        self._schedule_save()
+        self._show_enabled_count()
+        self._schedule_check_dirty()
 
     def _on_new(self, widget):
         self._open_sequence_editor(None)
@@ -1524,9 +1837,10 @@ class ConfigManager(Gtk.Window):
             return
 
         name = model[it][3]
-        path = USER_CONFIG_DIR / f"{name}.config.json"
-        if not path.exists():
+        path = self._config_path(name)
+        if not path:
             self._error("Config file not found")
+            self._refresh_list()
             return
 
         self._open_sequence_editor(path)
@@ -1575,11 +1889,15 @@ class ConfigManager(Gtk.Window):
     def _sync_order_from_store(self):
         """Persist enabled config order from current store row order."""
         enabled_in_order = [row[3] for row in self.store if row[0]]
-        self.enabled_configs = enabled_in_order + [
-            c for c in self.enabled_configs if c not in enabled_in_order
+        kept = set(enabled_in_order)
+        new_order = enabled_in_order + [
+            c for c in self.enabled_configs if c not in kept
         ]
-        self._save_enabled()
-        self._check_dirty()
+        if new_order == self.enabled_configs:
+            return  # swapped with a disabled row; nothing to persist
+        self.enabled_configs = new_order
+        self._schedule_save()
+        self._schedule_check_dirty()
 
     def _on_delete(self, widget):
         model, it = self._selected()
@@ -1587,8 +1905,7 @@ class ConfigManager(Gtk.Window):
             self._error("Select a config to delete")
             return
 
-        name = model[it][3]
-        display = model[it][1]
+        name, display = model.get(it, 3, 1)
 
         dlg = Gtk.MessageDialog(transient_for=self, modal=True,
                                 message_type=Gtk.MessageType.WARNING,
@@ -1603,7 +1920,9 @@ class ConfigManager(Gtk.Window):
 
         try:
             was_enabled = name in self.enabled_configs
-            (USER_CONFIG_DIR / f"{name}.config.json").unlink()
+            path = self._config_path(name) or USER_CONFIG_DIR / f"{name}.config.json"
+            path.unlink()
+            _json_cache.pop(str(path), None)
             self.enabled_configs = [c for c in self.enabled_configs if c != name]
             self._save_enabled()
             self._refresh_list()
@@ -1618,6 +1937,7 @@ class ConfigManager(Gtk.Window):
             self._error(f"Failed to delete: {e}")
 
     def _on_apply(self, widget):
+        self._flush_save()
         errors = self._validate_enabled()
         if errors:
             msg = "Cannot apply — fix these configs first:\n\n"
@@ -1628,12 +1948,14 @@ class ConfigManager(Gtk.Window):
         timeout = int(self.timeout_spin.get_value())
         loglevel = self.ll_combo.get_active_text()
 
+        # Start from the file, not self._settings: `umlaut config-enable` and
+        # `config-disable` may have changed it; only overlay this tab's keys
         overrides = load_settings()
         overrides.setdefault('settings', {})
         overrides['settings']['timeout_ms'] = timeout
         overrides['settings']['log_level'] = loglevel
-        overrides['passthrough_keys'] = self._pending_passthrough_keys
-        overrides['trigger_key'] = self._get_trigger_key_list()
+        overrides['passthrough_keys'] = list(self._pending_passthrough_keys)
+        overrides['trigger_key'] = list(self._get_trigger_key_list())
         icon_name = self.icon_combo.get_active_text()
         if icon_name and icon_name != '(none found)':
             overrides['icon_set'] = icon_name
@@ -1641,6 +1963,7 @@ class ConfigManager(Gtk.Window):
 
         try:
             save_settings(overrides)
+            self._settings = overrides
             self._disk_snapshot = self._snapshot(from_disk=True)
             self._settings_valid = True
             self._check_dirty()
@@ -1660,11 +1983,8 @@ class ConfigManager(Gtk.Window):
 
         # Restart applet to pick up new icon/settings
         try:
-            result = subprocess.run(['pgrep', '-f', 'umlaut_applet'],
-                                    capture_output=True, text=True)
             my_pid = os.getpid()
-            for pid_str in result.stdout.strip().splitlines():
-                pid = int(pid_str)
+            for pid in _find_applet_pids():
                 if pid != my_pid:
                     os.kill(pid, signal.SIGTERM)
             GLib.timeout_add(800, lambda: subprocess.Popen([str(APPLET_SCRIPT)]) and False)
@@ -1674,10 +1994,22 @@ class ConfigManager(Gtk.Window):
         self._set_status("✓ Changes applied — applet restarting")
 
     def _validate_config(self, path):
-        """Validate a single config file. Returns error string or None."""
+        """Validate a single config file. Returns error string or None.
+        The result is kept with the file's parse in _json_cache, so it is
+        reused while the file's mtime and size are unchanged."""
+        try:
+            entry = _json_cache_entry(path)
+        except json.JSONDecodeError as e:
+            return f"Invalid JSON: {e.msg} at line {e.lineno}"
+        except Exception as e:
+            return str(e)
+        if entry[2] is _UNCHECKED:
+            entry[2] = self._check_config(entry[1])
+        return entry[2]
+
+    def _check_config(self, cfg):
+        """Uncached structural checks on a parsed config behind _validate_config."""
         try:
-            with open(path) as f:
-                cfg = json.load(f)
             if not isinstance(cfg, dict):
                 return "Must be a JSON object"
             seqs = cfg.get('sequences', {})
@@ -1691,8 +2023,6 @@ class ConfigManager(Gtk.Window):
                 for target, output in targets.items():
                     if not isinstance(output, str):
                         return f"Output for '{compose_key}+{target}' must be a string"
-        except json.JSONDecodeError as e:
-            return f"Invalid JSON: {e.msg} at line {e.lineno}"
         except Exception as e:
             return str(e)
         return None
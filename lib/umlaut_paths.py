@@ -6,10 +6,27 @@ Import this in all umlaut scripts to avoid hardcoded path duplication.
 
 from pathlib import Path
 import json
+import os
 import logging
 
 logger = logging.getLogger('umlaut')
 
+# JSON helpers for all umlaut scripts: orjson (C/Rust) when installed,
+# stdlib json otherwise. json_dumps returns 2-space-indented UTF-8 bytes.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# keep catching the stdlib exception.
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
 # ── Installation paths ────────────────────────────────────────────────────
 INSTALL_DIR       = Path('/usr/local/bin/umlaut-scripts')
 UMLAUT_CTL        = Path('/usr/local/bin/umlaut')
@@ -59,7 +76,12 @@ def _apply_schema(data: dict, schema: dict) -> dict:
     for key, default in schema.items():
         val = data.get(key, default)
         if isinstance(default, dict) and isinstance(val, dict):
-            out[key] = {k: val.get(k, v) for k, v in default.items()}
+            # Start from the defaults (keeps schema key order), overlay known keys
+            merged = default.copy()
+            for k, v in val.items():
+                if k in default:
+                    merged[k] = v
+            out[key] = merged
         else:
             out[key] = val
     return out
@@ -72,25 +94,52 @@ def load_settings() -> dict:
     raw = {}
     if USER_SETTINGS.exists():
         try:
-            with open(USER_SETTINGS) as f:
-                raw = json.load(f)
+            with open(USER_SETTINGS, 'rb') as f:
+                raw = json_loads(f.read())
             if not isinstance(raw, dict):
                 raw = {}
         except Exception:
             raw = {}
     cleaned = _apply_schema(raw, SETTINGS_SCHEMA)
-    unknown = set(raw.keys()) - set(SETTINGS_SCHEMA.keys())
+    unknown = raw.keys() - SETTINGS_SCHEMA.keys()
     if unknown:
         logger.warning(f"settings.config.json: unknown keys dropped: {sorted(unknown)}")
     return cleaned
 
 
-def save_settings(data: dict) -> None:
-    """Save settings, stripping unknown keys before writing."""
+def atomic_write(path, data: bytes) -> None:
+    """Write data to a sibling temp file, fsync it and rename it over path,
+    so readers never see a torn file and a crash never leaves an empty one.
+    The temp file is removed if anything fails; the error is re-raised."""
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def save_settings(data: dict) -> bool:
+    """Save settings, stripping unknown keys before writing.
+    Skips the write if the file already holds the same bytes; otherwise
+    replaces it via atomic_write. Returns True if the file was written."""
     USER_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     cleaned = _apply_schema(data, SETTINGS_SCHEMA)
-    with open(USER_SETTINGS, 'w') as f:
-        json.dump(cleaned, f, indent=2, ensure_ascii=False)
+    payload = json_dumps(cleaned)
+    try:
+        if USER_SETTINGS.read_bytes() == payload:
+            return False
+    except OSError:
+        pass
+    atomic_write(USER_SETTINGS, payload)
+    return True
 
 
 def load_sequence_config(path) -> dict | None:
@@ -98,8 +147,8 @@ def load_sequence_config(path) -> dict | None:
     Unknown top-level keys dropped. Malformed entries dropped at smallest unit.
     Returns None if file is missing or not valid JSON."""
     try:
-        with open(path) as f:
-            raw = json.load(f)
+        with open(path, 'rb') as f:
+            raw = json_loads(f.read())
         if not isinstance(raw, dict):
             logger.debug(f"Sequence config {path}: not a JSON object")
             return None
@@ -119,10 +168,12 @@ def load_sequence_config(path) -> dict | None:
         return cleaned
 
     clean_seqs = {}
-    aliases = {}
+    aliases = None      # most configs have none; created on first alias
 
     for compose_key, targets in raw_seqs.items():
         if isinstance(targets, str):
+            if aliases is None:
+                aliases = {}
             aliases[compose_key] = targets
             continue
         if not isinstance(targets, dict):
@@ -139,11 +190,12 @@ def load_sequence_config(path) -> dict | None:
         else:
             logger.debug(f"{path}: dropping '{compose_key}' — no valid targets")
 
-    for compose_key, ref in aliases.items():
-        if ref in clean_seqs:
-            clean_seqs[compose_key] = ref
-        else:
-            logger.debug(f"{path}: dropping alias '{compose_key}' — references unknown '{ref}'")
+    if aliases:
+        for compose_key, ref in aliases.items():
+            if ref in clean_seqs:
+                clean_seqs[compose_key] = ref
+            else:
+                logger.debug(f"{path}: dropping alias '{compose_key}' — references unknown '{ref}'")
 
     cleaned['sequences'] = clean_seqs
     return cleaned
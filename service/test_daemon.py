@@ -5,6 +5,7 @@ Run from the service/ directory: python3 test_daemon.py
 """
 
 import json
+import os
 import sys
 import tempfile
 import types
@@ -41,10 +42,13 @@ def _make_evdev_mock():
         "KEY_HOME","KEY_END","KEY_PAGEUP","KEY_PAGEDOWN","KEY_DELETE",
         "KEY_CAPSLOCK","KEY_NUMLOCK","KEY_SCROLLLOCK",
         "EV_KEY","EV_SYN","SYN_REPORT",
+        "BTN_LEFT","BTN_RIGHT","BTN_MIDDLE","BTN_MOUSE",
+        "BTN_GAMEPAD","BTN_SOUTH","BTN_EAST","BTN_NORTH","BTN_WEST",
+        "BTN_A","BTN_B","BTN_X","BTN_Y",
     ]
-    for i, name in enumerate(_key_names):
-        setattr(ecodes, name, i + 1)
-    ecodes.KEY = {i + 1: name for i, name in enumerate(_key_names)}
+    codes = {name: i for i, name in enumerate(_key_names, 1)}
+    vars(ecodes).update(codes)
+    ecodes.KEY = {code: name for name, code in codes.items()}
     evdev.ecodes = ecodes
     evdev.UInput = MagicMock()
     evdev.InputDevice = MagicMock()
@@ -68,13 +72,15 @@ def make_config():
         cfg = UmlautConfig()
     cfg.trigger_keys_list = [ecodes.KEY_LEFTALT]
     cfg.passthrough_keys  = []
+    cfg.trigger_key_set   = frozenset(cfg.trigger_keys_list)
     return cfg
 
 
 class TestParseTargetKey(unittest.TestCase):
 
-    def setUp(self):
-        self.cfg = make_config()
+    @classmethod
+    def setUpClass(cls):
+        cls.cfg = make_config()   # read-only in these tests; share one
 
     def test_lowercase_letter(self):
         self.assertEqual(self.cfg._parse_target_key("a"), [ecodes.KEY_A])
@@ -118,8 +124,9 @@ class TestParseTargetKey(unittest.TestCase):
 
 class TestParseOutput(unittest.TestCase):
 
-    def setUp(self):
-        self.cfg = make_config()
+    @classmethod
+    def setUpClass(cls):
+        cls.cfg = make_config()   # read-only in these tests; share one
 
     def test_string(self):
         r = self.cfg._parse_output("hello")
@@ -130,6 +137,9 @@ class TestParseOutput(unittest.TestCase):
         r = self.cfg._parse_output("ä")
         self.assertEqual(r.action_type, "string")
 
+    def test_repeated_string_shares_action(self):
+        self.assertIs(self.cfg._parse_output("é"), self.cfg._parse_output("é"))
+
     def test_empty_string(self):
         r = self.cfg._parse_output("")
         self.assertEqual(r.data, "")
@@ -148,6 +158,138 @@ class TestParseOutput(unittest.TestCase):
             self.cfg._parse_output(["a"] * 11)
 
 
+class TestEmitString(unittest.TestCase):
+
+    def setUp(self):
+        self.daemon = _dm.UmlautDaemon.__new__(_dm.UmlautDaemon)
+        self.daemon.config = make_config()
+        self.daemon.xdotool_available = False
+        self.daemon.uinput = MagicMock()
+        self.r, self.daemon.uinput.fd = os.pipe()
+
+    def tearDown(self):
+        os.close(self.r)
+        os.close(self.daemon.uinput.fd)
+
+    def _events(self):
+        data = os.read(self.r, 65536)
+        return [(t, c, v) for _, _, t, c, v in _dm._INPUT_EVENT.iter_unpack(data)]
+
+    def test_shifted_char_frames(self):
+        self.daemon.emit_string('A')
+        syn = (ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+        self.assertEqual(self._events(), [
+            (ecodes.EV_KEY, ecodes.KEY_LEFTSHIFT, 1), syn,
+            (ecodes.EV_KEY, ecodes.KEY_A, 1), syn,
+            (ecodes.EV_KEY, ecodes.KEY_A, 0), syn,
+            (ecodes.EV_KEY, ecodes.KEY_LEFTSHIFT, 0), syn,
+        ])
+        self.daemon.uinput.write.assert_not_called()
+
+
+class TestXTestType(unittest.TestCase):
+
+    def setUp(self):
+        self.daemon = _dm.UmlautDaemon.__new__(_dm.UmlautDaemon)
+        self.daemon._xdisplay = MagicMock()
+        self.daemon._xtest_free = [250, 251]
+        self.daemon._xtest_bound = _dm.OrderedDict()
+        self.daemon._last_frames_time = 0.0
+        self.pressed = []
+        fake_input = lambda disp, kind, keycode: self.pressed.append((kind, keycode))
+        self.patches = [
+            patch.object(_dm, 'xtest', types.SimpleNamespace(fake_input=fake_input), create=True),
+            patch.object(_dm, 'X', types.SimpleNamespace(KeyPress=2, KeyRelease=3), create=True),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_reuses_bound_keycode(self):
+        self.assertEqual(self.daemon._xtest_type('ää'), 2)
+        self.assertEqual(self.pressed, [(2, 251), (3, 251), (2, 251), (3, 251)])
+        self.daemon._xdisplay.change_keyboard_mapping.assert_called_once_with(251, [(0xe4, 0xe4)])
+
+    def test_rebinds_least_recently_used(self):
+        self.daemon._xtest_type('äöü')
+        self.assertEqual(self.daemon._xtest_bound, {0xf6: 250, 0xfc: 251})
+        self.daemon._xtest_type('€')
+        self.assertEqual(self.daemon._xtest_bound, {0xfc: 251, 0x010020ac: 250})
+
+    def test_control_characters_use_key_keysyms(self):
+        self.assertEqual(self.daemon._xtest_type('\n\t'), 2)
+        self.assertEqual(self.daemon._xtest_bound, {0xff0d: 251, 0xff09: 250})
+
+    def test_x_error_disables_xtest(self):
+        self.daemon._xdisplay.flush.side_effect = RuntimeError('connection lost')
+        self.assertEqual(self.daemon._xtest_type('ä'), 0)
+        self.assertIsNone(self.daemon._xdisplay)
+
+    def test_setup_failure_closes_display(self):
+        disp = MagicMock()
+        disp.get_keyboard_mapping.side_effect = RuntimeError('bad reply')
+        self.daemon._xdisplay = None
+        with patch.object(_dm, 'xdisplay', types.SimpleNamespace(Display=lambda: disp)), \
+                patch.dict(os.environ, {'DISPLAY': ':0'}, clear=True):
+            self.daemon._setup_xtest()
+        disp.close.assert_called_once_with()
+        self.assertIsNone(self.daemon._xdisplay)
+
+    def test_fallback_resumes_after_sent_characters(self):
+        self.daemon._xdisplay.flush.side_effect = [None, RuntimeError('connection lost')]
+        self.daemon.xdotool_available = True
+        with patch.object(_dm.subprocess, 'run') as run:
+            self.daemon.emit_unicode_text('äöü')
+        typed = [c.args[0][-1] for c in run.call_args_list]
+        self.assertEqual(typed, ['öü'])
+
+
+class TestDrainInotify(unittest.TestCase):
+
+    def _event(self, name):
+        raw = name.encode() + b'\x00' * (16 - len(name))
+        return _dm._INOTIFY_EVENT.pack(1, 0x100, 0, len(raw)) + raw
+
+    def test_keeps_only_event_nodes(self):
+        daemon = _dm.UmlautDaemon.__new__(_dm.UmlautDaemon)
+        r, w = os.pipe()
+        daemon._inotify_fd = r
+        daemon._inotify_buf = bytearray(4096)
+        os.write(w, self._event('js0') + self._event('event7') + self._event('mouse2'))
+        os.close(w)
+        try:
+            self.assertEqual(daemon._drain_inotify(), ['/dev/input/event7'])
+        finally:
+            os.close(r)
+
+
+class TestReloadConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.daemon = _dm.UmlautDaemon.__new__(_dm.UmlautDaemon)
+        self.daemon.config = make_config()
+        self.daemon.force_release_all = MagicMock()
+
+    def test_failed_reload_keeps_running_config(self):
+        old = self.daemon.config
+        with patch.object(_dm, 'UmlautConfig', lambda: _dm._fatal_error('boom')):
+            self.daemon.reload_config()
+        self.assertIs(self.daemon.config, old)
+        self.daemon.force_release_all.assert_not_called()
+
+    def test_successful_reload_swaps_config(self):
+        new = make_config()
+        new.timeout_ms = 500
+        with patch.object(_dm, 'UmlautConfig', lambda: new):
+            self.daemon.reload_config()
+        self.assertIs(self.daemon.config, new)
+        self.assertEqual(self.daemon.timeout_sec, 0.5)
+        self.daemon.force_release_all.assert_called_once()
+
+
 class TestLoadSingleConfig(unittest.TestCase):
 
     def setUp(self):
@@ -199,7 +341,7 @@ class TestLoadSingleConfig(unittest.TestCase):
             "SHIFT+;": ";",
         }})
         self.cfg._load_single_config(path, is_system=False)
-        shifted = [k for k in self.cfg.sequences if k[1] is True]
+        shifted = [k for k in self.cfg.sequences if k[0] is True]
         self.assertTrue(len(shifted) > 0)
 
     def test_output_value_preserved(self):
@@ -259,6 +401,44 @@ class TestApplySchema(unittest.TestCase):
         self.assertTrue(any('mystery_field' in m for m in cm.output))
         import os; os.unlink(tmp)
 
+
+class TestSaveSettings(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'settings.config.json'
+        self.patches = [
+            patch.object(_up, 'USER_CONFIG_DIR', Path(self.tmp.name)),
+            patch.object(_up, 'USER_SETTINGS', self.path),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        self.tmp.cleanup()
+
+    def test_writes_then_skips_identical(self):
+        self.assertTrue(_up.save_settings({'icon_set': 'mono'}))
+        self.assertEqual(_up.load_settings()['icon_set'], 'mono')
+        self.assertFalse(_up.save_settings({'icon_set': 'mono'}))
+
+    def test_rewrites_on_change(self):
+        _up.save_settings({'icon_set': 'mono'})
+        self.assertTrue(_up.save_settings({'icon_set': 'default'}))
+        self.assertEqual(_up.load_settings()['icon_set'], 'default')
+        self.assertEqual(os.listdir(self.tmp.name), ['settings.config.json'])
+
+    def test_failed_write_keeps_old_file(self):
+        _up.save_settings({'icon_set': 'mono'})
+        with patch.object(_up.os, 'fsync', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                _up.save_settings({'icon_set': 'default'})
+        self.assertEqual(_up.load_settings()['icon_set'], 'mono')
+        self.assertEqual(os.listdir(self.tmp.name), ['settings.config.json'])
+
+
 class TestLoadSequenceConfig(unittest.TestCase):
 
     def setUp(self):
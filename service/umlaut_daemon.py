@@ -19,19 +19,67 @@ import argparse
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from collections import OrderedDict
+from itertools import groupby
 from evdev import UInput, ecodes as e
 
+# Optional: python-xlib lets Unicode output go through XTEST in-process
+# instead of spawning xdotool for every run of characters
+try:
+    from Xlib import X, display as xdisplay
+    from Xlib.ext import xtest
+except ImportError:
+    xdisplay = None
+
 # Import shared path helpers (umlaut_paths.py installed alongside this script)
 sys.path.insert(0, str(Path(__file__).parent))
 try:
-    from umlaut_paths import load_sequence_config, TEST_MODE_FILE
+    from umlaut_paths import load_sequence_config, TEST_MODE_FILE, json_loads as _loads
 except ImportError:
     load_sequence_config = None  # graceful degradation if not installed yet
     TEST_MODE_FILE = Path('/tmp/umlaut_test_mode')
+    _loads = json.loads
 
 # Logging will be configured in main() based on args
 logger = logging.getLogger('umlaut')
 
+# struct input_event: timeval (two native longs), type, code, value.
+# The kernel stamps the time on uinput writes, so the timeval stays zero.
+_INPUT_EVENT = struct.Struct('llHHi')
+_SYN_EVENT = _INPUT_EVENT.pack(0, 0, e.EV_SYN, e.SYN_REPORT, 0)
+
+# struct inotify_event header: wd, mask, cookie, len (name follows)
+_INOTIFY_EVENT = struct.Struct('iIII')
+
+# Hotplugged nodes are opened this long after creation, so udev can apply
+# permissions; a failed open is retried up to HOTPLUG_MAX_ATTEMPTS times
+HOTPLUG_SETTLE_SEC = 0.3
+HOTPLUG_MAX_ATTEMPTS = 5
+
+# Pause between a uinput burst and XTEST input so X sees them in order
+XTEST_SETTLE_SEC = 0.005
+
+# Control characters have no Unicode keysym; type them as the keys xdotool
+# uses (Return, Tab, ...). Other C0 controls are not typeable and are skipped.
+_XTEST_CONTROL_KEYSYMS = {
+    '\n': 0xff0d,    # XK_Return
+    '\r': 0xff0d,    # XK_Return
+    '\t': 0xff09,    # XK_Tab
+    '\b': 0xff08,    # XK_BackSpace
+    '\x1b': 0xff1b,  # XK_Escape
+    '\x7f': 0xffff,  # XK_Delete
+}
+
+# KEY_* name -> code, resolved once instead of a getattr per config entry
+_KEY_CODES = {name: code for name, code in vars(e).items()
+              if name.startswith('KEY_') and isinstance(code, int)}
+
+
+def _key_frame(key_code: int, value: int) -> bytes:
+    """Pack one EV_KEY event followed by its SYN_REPORT"""
+    return _INPUT_EVENT.pack(0, 0, e.EV_KEY, key_code, value) + _SYN_EVENT
+
+
 def _fatal_error(msg: str):
     """Log error and exit non-zero so systemd marks unit failed."""
     logger.error(msg)
@@ -41,6 +89,8 @@ def _fatal_error(msg: str):
 @dataclass
 class OutputAction:
     """Represents an output action"""
+    __slots__ = ('action_type', 'data')
+
     action_type: str  # 'key', 'string', 'sequence'
     data: any  # Depends on type
 
@@ -48,7 +98,9 @@ class OutputAction:
 @dataclass
 class KeySequence:
     """Represents a key sequence mapping"""
-    modifier_keys: List[int]  # Trigger key codes (e.g., KEY_LEFTALT)
+    # One instance per (trigger, compose, target) entry; no per-instance dict
+    __slots__ = ('compose_key', 'compose_shifted', 'target_keys', 'output')
+
     compose_key: int          # Compose key code (e.g., KEY_SEMICOLON)
     compose_shifted: bool     # Whether compose key requires Shift
     target_keys: List[int]    # Target key codes including modifiers
@@ -91,10 +143,26 @@ class UmlautConfig:
         '<': (',', True), '>': ('.', True), '?': ('/', True),
     }
     
+    # Character -> packed uinput frames that type it, shift included,
+    # so emit_string does one dict lookup per character
+    CHAR_FRAMES = {}
+    for _char, _code in CHAR_TO_KEY.items():
+        CHAR_FRAMES[_char] = _key_frame(_code, 1) + _key_frame(_code, 0)
+    for _char, (_base, _) in SHIFTED_CHARS.items():
+        CHAR_FRAMES[_char] = (_key_frame(e.KEY_LEFTSHIFT, 1) + CHAR_FRAMES[_base]
+                              + _key_frame(e.KEY_LEFTSHIFT, 0))
+    del _char, _code, _base, _
+    
     def __init__(self):
         self.sequences: Dict[Tuple[int, ...], KeySequence] = {}
         self.trigger_keys_list: List[int] = []
         self.passthrough_keys: List[int] = []  # Keys that abort compose even if mapped
+        self.compose_keys: set = set()  # Compose keys that start at least one sequence
+        # Set views of the two lists above for per-event membership tests
+        self.trigger_key_set: frozenset = frozenset()
+        self.passthrough_key_set: frozenset = frozenset()
+        self._target_cache: Dict[str, List[int]] = {}  # target notation -> parsed key codes
+        self._output_cache: Dict[str, OutputAction] = {}  # output string -> shared action
         # Settings with defaults
         self.timeout_ms: int = 1000
         self.log_level: str = 'INFO'
@@ -110,6 +178,8 @@ class UmlautConfig:
         self.sequences.clear()
         self.trigger_keys_list.clear()
         self.passthrough_keys.clear()
+        self._target_cache.clear()
+        self._output_cache.clear()
 
         # Load settings (trigger key, passthrough keys, timeout etc.)
         settings_path = Path.home() / '.config' / 'umlaut' / 'settings.config.json'
@@ -119,6 +189,11 @@ class UmlautConfig:
         # Load enabled sequence configs
         self._load_enabled_configs()
 
+        # sequence keys are (shift_flag, compose, *targets)
+        self.compose_keys = {sequence_key[1] for sequence_key in self.sequences}
+        self.trigger_key_set = frozenset(self.trigger_keys_list)
+        self.passthrough_key_set = frozenset(self.passthrough_keys)
+
         logger.info(f"Total loaded: {len(self.sequences)} key sequences")
 
         # Fatal validation
@@ -137,8 +212,8 @@ class UmlautConfig:
             sequences_allowed: If False, sequences in this config are ignored
         """
         try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
+            with open(config_path, 'rb') as f:
+                config = _loads(f.read())
         except FileNotFoundError:
             if is_system:
                 _fatal_error(f"Config file not found: {config_path}")
@@ -273,19 +348,17 @@ class UmlautConfig:
                         target_keys = self._parse_target_key(target_name)
                         output_action = self._parse_output(output_def)
                         
-                        # Build lookup key
-                        for mod_key in self.trigger_keys_list:
-                            lookup_key = (mod_key, compose_shifted, compose_key_code, *target_keys)
-                            
-                            # Add or override sequence
-                            self.sequences[lookup_key] = KeySequence(
-                                modifier_keys=[mod_key],
-                                compose_key=compose_key_code,
-                                compose_shifted=compose_shifted,
-                                target_keys=target_keys,
-                                output=output_action
-                            )
-                            sequences_added += 1
+                        # Build lookup key (shared by every trigger key)
+                        lookup_key = (compose_shifted, compose_key_code, *target_keys)
+                        
+                        # Add or override sequence
+                        self.sequences[lookup_key] = KeySequence(
+                            compose_key=compose_key_code,
+                            compose_shifted=compose_shifted,
+                            target_keys=target_keys,
+                            output=output_action
+                        )
+                        sequences_added += 1
                         
                         logger.debug(f"  {target_name} -> {output_def}")
                     
@@ -339,16 +412,14 @@ class UmlautConfig:
                     try:
                         target_keys = self._parse_target_key(target_name)
                         output_action = self._parse_output(output_def)
-                        for mod_key in self.trigger_keys_list:
-                            lookup_key = (mod_key, compose_shifted, compose_key_code, *target_keys)
-                            self.sequences[lookup_key] = KeySequence(
-                                modifier_keys=[mod_key],
-                                compose_key=compose_key_code,
-                                compose_shifted=compose_shifted,
-                                target_keys=target_keys,
-                                output=output_action
-                            )
-                            sequences_added += 1
+                        lookup_key = (compose_shifted, compose_key_code, *target_keys)
+                        self.sequences[lookup_key] = KeySequence(
+                            compose_key=compose_key_code,
+                            compose_shifted=compose_shifted,
+                            target_keys=target_keys,
+                            output=output_action
+                        )
+                        sequences_added += 1
                     except ValueError as ex:
                         logger.warning(f"Skipping {compose_key_name}+{target_name}: {ex}")
             except ValueError as ex:
@@ -362,8 +433,8 @@ class UmlautConfig:
         user_config_dir = Path.home() / '.config' / 'umlaut'
 
         try:
-            with open(settings_path) as f:
-                settings = json.load(f)
+            with open(settings_path, 'rb') as f:
+                settings = _loads(f.read())
             enabled_configs = settings.get('enabled_sequences', [])
         except FileNotFoundError:
             logger.debug("settings.config.json not found — no sequence configs loaded")
@@ -389,6 +460,16 @@ class UmlautConfig:
                 logger.error(f"Failed to load config '{config_name}': {e}")
     
     def _parse_target_key(self, target: str) -> List[int]:
+        """Memoized _parse_target_key_uncached (targets recur under every compose key).
+
+        Callers must not mutate the returned list; it is shared.
+        """
+        key_codes = self._target_cache.get(target)
+        if key_codes is None:
+            key_codes = self._target_cache[target] = self._parse_target_key_uncached(target)
+        return key_codes
+
+    def _parse_target_key_uncached(self, target: str) -> List[int]:
         """Parse target key notation like 'a', 'A', '$', 'CTRL+o' into key codes"""
         key_codes = []
         
@@ -451,7 +532,11 @@ class UmlautConfig:
             MAX_OUTPUT_LENGTH = 10000  # 10KB limit
             if len(output_def) > MAX_OUTPUT_LENGTH:
                 raise ValueError(f"Output string too long ({len(output_def)} chars), max is {MAX_OUTPUT_LENGTH}")
-            return OutputAction(action_type='string', data=output_def)
+            # Outputs like 'é' recur across configs; share one action per string
+            action = self._output_cache.get(output_def)
+            if action is None:
+                action = self._output_cache[output_def] = OutputAction(action_type='string', data=output_def)
+            return action
         
         # List/sequence output
         if isinstance(output_def, list):
@@ -493,34 +578,41 @@ class UmlautConfig:
             key_name = f'KEY_{key_name.upper()}'
         
         try:
-            return getattr(e, key_name)
-        except AttributeError:
+            return _KEY_CODES[key_name]
+        except KeyError:
             raise ValueError(f"Unknown key name: {key_name}")
 
 
 class UmlautDaemon:
     """Main daemon that intercepts and remaps keyboard events"""
     
+    # Modifier groups for the state machine, built once instead of per event
+    SHIFT_KEYS = frozenset({e.KEY_LEFTSHIFT, e.KEY_RIGHTSHIFT})
+    CTRL_KEYS = frozenset({e.KEY_LEFTCTRL, e.KEY_RIGHTCTRL})
+    ALT_KEYS = frozenset({e.KEY_LEFTALT, e.KEY_RIGHTALT})
+    META_KEYS = frozenset({e.KEY_LEFTMETA, e.KEY_RIGHTMETA})
+    CTRL_META_KEYS = CTRL_KEYS | META_KEYS
+    MODIFIER_KEYS = SHIFT_KEYS | CTRL_KEYS | ALT_KEYS | META_KEYS
+    
     def __init__(self):
         self.config = UmlautConfig()
         self.timeout_ms = self.config.timeout_ms
         self.timeout_sec = self.timeout_ms / 1000.0
         
         self.running = False
+        self.test_mode = False  # refreshed once per poll wakeup in run()
+        self.reload_pending = False  # set by SIGHUP, handled between events in run()
         self.devices = []
         self.uinput = None
         self.xdotool_available = False
+        self._xdisplay = None        # X connection for XTEST Unicode output
+        self._xtest_free = []        # unmapped keycodes not yet bound
+        self._xtest_bound = OrderedDict()  # keysym -> scratch keycode, LRU order
+        self._last_frames_time = 0.0  # monotonic time of the last uinput burst
         self._inotify_fd = None   # inotify fd for USB hotplug detection
         self._inotify_wd = None
-        
-        # Precompute set of valid compose keys for O(1) lookup
-        # Extract compose keys from sequence tuples: (modifier, shift_flag, compose, ...)
-        self.valid_compose_keys = set()
-        for sequence_key in self.config.sequences.keys():
-            # sequence_key is a tuple: (modifier, shift_flag, compose_key, ...)
-            if len(sequence_key) >= 3:
-                compose_key = sequence_key[2]  # Third element is compose key
-                self.valid_compose_keys.add(compose_key)
+        self._inotify_buf = None
+        self._pending_devices = {}  # hotplugged path -> (monotonic open time, attempt)
         
         # State machine: IDLE -> MODIFIER_PRESSED -> COMPOSE_PRESSED -> WAITING_TARGET
         self.state = 'IDLE'
@@ -530,78 +622,83 @@ class UmlautDaemon:
         self.current_trigger = None  # Which modifier key was pressed
         self.current_compose = None   # Which compose key was pressed
         self.compose_shifted = False  # Was shift held when compose was pressed
-        self.compose_start_time = 0
-        self.trigger_start_time = 0   # When compose became active
-        self.trigger_start_time = 0  # When modifier was first pressed
+        # time.monotonic() at which TRIGGER_PRESSED / WAITING_TARGET times out
+        self.deadline = 0.0
         
     def find_keyboard_devices(self) -> List[evdev.InputDevice]:
         """Find all keyboard input devices, excluding mice, touchpads, and media controls"""
-        # Keys that define a real keyboard - must have majority of these
-        REAL_KEYBOARD_KEYS = {
-            e.KEY_A, e.KEY_B, e.KEY_C, e.KEY_D, e.KEY_E,
-            e.KEY_SPACE, e.KEY_ENTER, e.KEY_BACKSPACE,
-            e.KEY_LEFTSHIFT, e.KEY_LEFTCTRL
-        }
-        MIN_KEYBOARD_KEYS = 8  # Must match at least 8 of the above
-
         devices = []
         for device_path in evdev.list_devices():
             device = evdev.InputDevice(device_path)
-
-            # Never grab our own virtual keyboard
-            if device.name == 'umlaut-virtual-keyboard':
-                continue
-
-            # Check if device has key events at all
-            caps = device.capabilities()
-            if e.EV_KEY not in caps:
-                continue
-
-            # Skip if device has relative axes (mouse/touchpad)
-            if e.EV_REL in caps:
-                logger.debug(f"Skipping {device.name} (has EV_REL - likely mouse/touchpad)")
+            if not self._is_keyboard(device):
+                device.close()
                 continue
-
-            # Skip if device has absolute axes but no keyboard keys (touchscreen/touchpad/tablet)
-            if e.EV_ABS in caps:
-                abs_axes = caps[e.EV_ABS]
-                # Check for mouse/touchpad absolute positioning
-                if e.ABS_X in abs_axes or e.ABS_Y in abs_axes:
-                    logger.debug(f"Skipping {device.name} (has ABS_X/ABS_Y - touchscreen/tablet)")
-                    continue
-                # Check for multitouch (touchscreen/touchpad)
-                if e.ABS_MT_POSITION_X in abs_axes:
-                    logger.debug(f"Skipping {device.name} (has multitouch - touchscreen/touchpad)")
-                    continue
-                # If has ABS but it's for other purposes (joystick/gamepad), check for gamepad buttons
-                keys = set(caps[e.EV_KEY])
-                gamepad_buttons = {e.BTN_GAMEPAD, e.BTN_SOUTH, e.BTN_EAST, e.BTN_NORTH, e.BTN_WEST, 
-                                  e.BTN_A, e.BTN_B, e.BTN_X, e.BTN_Y}
-                if keys & gamepad_buttons:
-                    logger.debug(f"Skipping {device.name} (has gamepad buttons)")
-                    continue
-            
-            # Skip if device has mouse buttons
-            if e.EV_KEY in caps:
-                keys = set(caps[e.EV_KEY])
-                mouse_buttons = {e.BTN_LEFT, e.BTN_RIGHT, e.BTN_MIDDLE, e.BTN_MOUSE}
-                if keys & mouse_buttons:
-                    logger.debug(f"Skipping {device.name} (has mouse buttons)")
-                    continue
-
-            # Check if device has enough real keyboard keys
-            # This filters out BT headsets, media remotes, game controllers etc.
-            keys = set(caps[e.EV_KEY])
-            keyboard_matches = len(keys & REAL_KEYBOARD_KEYS)
-            if keyboard_matches < MIN_KEYBOARD_KEYS:
-                logger.debug(f"Skipping {device.name} (only {keyboard_matches}/{MIN_KEYBOARD_KEYS} keyboard keys - likely media/BT device)")
-                continue
-
             devices.append(device)
             logger.info(f"Found keyboard: {device.name} at {device_path}")
 
         return devices
-    
+
+    # Keys that define a real keyboard - must have majority of these
+    REAL_KEYBOARD_KEYS = frozenset({
+        e.KEY_A, e.KEY_B, e.KEY_C, e.KEY_D, e.KEY_E,
+        e.KEY_SPACE, e.KEY_ENTER, e.KEY_BACKSPACE,
+        e.KEY_LEFTSHIFT, e.KEY_LEFTCTRL
+    })
+    MIN_KEYBOARD_KEYS = 8  # Must match at least 8 of the above
+    GAMEPAD_BUTTONS = frozenset({
+        e.BTN_GAMEPAD, e.BTN_SOUTH, e.BTN_EAST, e.BTN_NORTH, e.BTN_WEST,
+        e.BTN_A, e.BTN_B, e.BTN_X, e.BTN_Y
+    })
+    MOUSE_BUTTONS = frozenset({e.BTN_LEFT, e.BTN_RIGHT, e.BTN_MIDDLE, e.BTN_MOUSE})
+
+    def _is_keyboard(self, device) -> bool:
+        """Capability filter for a single opened device. Used for the startup
+        scan and for each hotplugged node, so both grab the same devices."""
+        # Never grab our own virtual keyboard
+        if device.name == 'umlaut-virtual-keyboard':
+            return False
+
+        # Check if device has key events at all
+        caps = device.capabilities(verbose=False)
+        if e.EV_KEY not in caps:
+            return False
+
+        # Skip if device has relative axes (mouse/touchpad)
+        if e.EV_REL in caps:
+            logger.debug(f"Skipping {device.name} (has EV_REL - likely mouse/touchpad)")
+            return False
+
+        keys = frozenset(caps[e.EV_KEY])
+
+        # Skip if device has absolute axes but no keyboard keys (touchscreen/touchpad/tablet)
+        if e.EV_ABS in caps:
+            abs_axes = caps[e.EV_ABS]
+            # Check for mouse/touchpad absolute positioning
+            if e.ABS_X in abs_axes or e.ABS_Y in abs_axes:
+                logger.debug(f"Skipping {device.name} (has ABS_X/ABS_Y - touchscreen/tablet)")
+                return False
+            # Check for multitouch (touchscreen/touchpad)
+            if e.ABS_MT_POSITION_X in abs_axes:
+                logger.debug(f"Skipping {device.name} (has multitouch - touchscreen/touchpad)")
+                return False
+            # If has ABS but it's for other purposes (joystick/gamepad), check for gamepad buttons
+            if not keys.isdisjoint(self.GAMEPAD_BUTTONS):
+                logger.debug(f"Skipping {device.name} (has gamepad buttons)")
+                return False
+
+        # Skip if device has mouse buttons
+        if not keys.isdisjoint(self.MOUSE_BUTTONS):
+            logger.debug(f"Skipping {device.name} (has mouse buttons)")
+            return False
+
+        # Check if device has enough real keyboard keys
+        # This filters out BT headsets, media remotes, game controllers etc.
+        keyboard_matches = len(keys & self.REAL_KEYBOARD_KEYS)
+        if keyboard_matches < self.MIN_KEYBOARD_KEYS:
+            logger.debug(f"Skipping {device.name} (only {keyboard_matches}/{self.MIN_KEYBOARD_KEYS} keyboard keys - likely media/BT device)")
+            return False
+        return True
+
     def setup_uinput(self):
         """Create virtual keyboard for output"""
         # Get all key capabilities from original devices
@@ -641,96 +738,97 @@ class UmlautDaemon:
             except Exception as ex:
                 logger.warning(f"Error releasing {device.name}: {ex}")
     
+    def _write_frames(self, frames: List[bytes]):
+        """Write packed key frames to uinput in a single syscall"""
+        if frames:
+            os.write(self.uinput.fd, b''.join(frames))
+            self._last_frames_time = time.monotonic()
+
+    def _emit_keys(self, keys: List[Tuple[int, int]]):
+        """Emit (key_code, value) pairs, each in its own SYN frame, with one write"""
+        self._write_frames([_key_frame(code, value) for code, value in keys])
+
     def emit_key(self, key_code: int, value: int, modifiers: List[int] = None):
         """Emit a key event with optional modifiers"""
+        frames = []
         if modifiers:
             # Press modifiers
             for mod in modifiers:
-                self.uinput.write(e.EV_KEY, mod, 1)
-                self.uinput.syn()
+                frames.append(_key_frame(mod, 1))
         
         # Press/release the key
-        self.uinput.write(e.EV_KEY, key_code, value)
-        self.uinput.syn()
+        frames.append(_key_frame(key_code, value))
         
         if modifiers and value == 0:  # Release modifiers on key release
             for mod in modifiers:
-                self.uinput.write(e.EV_KEY, mod, 0)
-                self.uinput.syn()
+                frames.append(_key_frame(mod, 0))
+        self._write_frames(frames)
     
     def emit_string(self, text: str):
         """Type a string of characters, handling shift for uppercase and Unicode"""
+        frames = []
+        pending = ''  # run of characters that need xdotool
+        char_frames = self.config.CHAR_FRAMES
         for char in text:
-            # Check if character is ASCII and in our character map
-            if ord(char) <= 127 and (char in self.config.CHAR_TO_KEY or char in self.config.SHIFTED_CHARS):
-                # Use direct key emission for ASCII characters
-                needs_shift = False
-                base_char = char
-                
-                if char in self.config.SHIFTED_CHARS:
-                    base_char, needs_shift = self.config.SHIFTED_CHARS[char]
-                
-                # Get key code
-                if base_char in self.config.CHAR_TO_KEY:
-                    key_code = self.config.CHAR_TO_KEY[base_char]
-                    
-                    if needs_shift:
-                        self.uinput.write(e.EV_KEY, e.KEY_LEFTSHIFT, 1)
-                        self.uinput.syn()
-                    
-                    # Press and release key
-                    self.uinput.write(e.EV_KEY, key_code, 1)
-                    self.uinput.syn()
-                    self.uinput.write(e.EV_KEY, key_code, 0)
-                    self.uinput.syn()
-                    
-                    if needs_shift:
-                        self.uinput.write(e.EV_KEY, e.KEY_LEFTSHIFT, 0)
-                        self.uinput.syn()
-                else:
-                    logger.warning(f"Cannot type character: {char}")
+            frame = char_frames.get(char)
+            if frame is not None:
+                # Use direct key emission for characters on the key map
+                if pending:
+                    self.emit_unicode_text(pending)
+                    pending = ''
+                frames.append(frame)
             else:
-                # Unicode character - use Ctrl+Shift+U method
-                self.emit_unicode_char(char)
+                # Unicode character - flush pending keys so ordering is kept,
+                # then collect it so a run costs one xdotool call, not one per char
+                self._write_frames(frames)
+                frames = []
+                pending += char
+        self._write_frames(frames)
+        if pending:
+            self.emit_unicode_text(pending)
     
-    def emit_unicode_char(self, char: str):
-        """Emit a Unicode character using xdotool
+    def emit_unicode_text(self, text: str):
+        """Emit a run of Unicode characters using xdotool
         
-        This works on X11 systems with xdotool installed.
-        For uppercase characters, holds shift before typing.
+        Uses XTEST in-process when python-xlib is available, otherwise
+        xdotool. With xdotool, uppercase characters are typed with shift
+        held, one xdotool call per run of same-case characters.
         """
-        # Security: Validate char is a single character
-        if len(char) != 1:
-            logger.error(f"emit_unicode_char requires single character, got: {repr(char)}")
-            return
-        
+        if self._xdisplay is not None:
+            # On an X error, xdotool picks up from the first untyped character
+            text = text[self._xtest_type(text):]
+            if not text:
+                return
+
         if not self.xdotool_available:
-            logger.warning(f"xdotool unavailable — cannot type Unicode character: {char!r}")
+            logger.warning(f"xdotool unavailable — cannot type Unicode text: {text!r}")
             return
 
-        env = os.environ.copy()
-        logger.debug(f"xdotool type: {char!r}")
-        try:
-            if char.isupper():
-                subprocess.run(['xdotool', 'keydown', 'shift'],
-                               check=True, capture_output=True, timeout=1, env=env)
-                subprocess.run(['xdotool', 'type', '--clearmodifiers', '--delay', '20', '--', char],
-                               check=True, capture_output=True, timeout=1, env=env)
-                subprocess.run(['xdotool', 'keyup', 'shift'],
-                               check=True, capture_output=True, timeout=1, env=env)
-            else:
-                subprocess.run(['xdotool', 'type', '--clearmodifiers', '--delay', '20', '--', char],
-                               check=True, capture_output=True, timeout=1, env=env)
-            logger.debug(f"xdotool success: {char!r}")
-        except subprocess.TimeoutExpired:
-            logger.error(f"xdotool timeout typing: {char!r}")
-        except subprocess.CalledProcessError as ex:
-            logger.error(f"xdotool failed for {char!r}: {ex.stderr}")
-        except FileNotFoundError:
-            logger.warning("xdotool not found — disabling Unicode output")
-            self.xdotool_available = False
-        self._inotify_fd = None   # inotify fd for USB hotplug detection
-        self._inotify_wd = None
+        for upper, run in groupby(text, key=str.isupper):
+            run = ''.join(run)
+            logger.debug(f"xdotool type: {run!r}")
+            # --delay 20 is per character; leave the timeout room for the run
+            timeout = 1 + 0.02 * len(run)
+            try:
+                if upper:
+                    subprocess.run(['xdotool', 'keydown', 'shift'],
+                                   check=True, capture_output=True, timeout=1)
+                    subprocess.run(['xdotool', 'type', '--clearmodifiers', '--delay', '20', '--', run],
+                                   check=True, capture_output=True, timeout=timeout)
+                    subprocess.run(['xdotool', 'keyup', 'shift'],
+                                   check=True, capture_output=True, timeout=1)
+                else:
+                    subprocess.run(['xdotool', 'type', '--clearmodifiers', '--delay', '20', '--', run],
+                                   check=True, capture_output=True, timeout=timeout)
+                logger.debug(f"xdotool success: {run!r}")
+            except subprocess.TimeoutExpired:
+                logger.error(f"xdotool timeout typing: {run!r}")
+            except subprocess.CalledProcessError as ex:
+                logger.error(f"xdotool failed for {run!r}: {ex.stderr}")
+            except FileNotFoundError:
+                logger.warning("xdotool not found — disabling Unicode output")
+                self.xdotool_available = False
+                return
     
     def emit_output(self, output: OutputAction, target_was_shifted: bool = False):
         """Emit output based on action type
@@ -757,8 +855,7 @@ class UmlautDaemon:
                 
                 # Auto-add SHIFT if target was shifted and SHIFT not already present
                 if target_was_shifted:
-                    shift_keys = {e.KEY_LEFTSHIFT, e.KEY_RIGHTSHIFT}
-                    if not any(mod in shift_keys for mod in modifiers):
+                    if self.SHIFT_KEYS.isdisjoint(modifiers):
                         modifiers.append(e.KEY_LEFTSHIFT)
                 
                 self.emit_key(key_code, 1, modifiers)
@@ -781,64 +878,54 @@ class UmlautDaemon:
         self.current_trigger = None
         self.current_compose = None
         self.compose_shifted = False
-        self.compose_start_time = 0
-        self.trigger_start_time = 0
+        self.deadline = 0.0
         self.pressed_keys.clear()  # apps like LibreOffice swallow key-up events, leaving stale state
 
     def force_release_all(self):
         """Force release all modifier and compose keys - emergency unstick"""
         logger.debug("Force releasing all compose keys")
+        keys = []
         if self.current_trigger:
-            self.uinput.write(e.EV_KEY, self.current_trigger, 0)
-            self.uinput.syn()
+            keys.append((self.current_trigger, 0))
         if self.current_compose:
-            self.uinput.write(e.EV_KEY, self.current_compose, 0)
-            self.uinput.syn()
+            keys.append((self.current_compose, 0))
         #Release shift if it was part of compose
-        self.uinput.write(e.EV_KEY, e.KEY_LEFTSHIFT, 0)
-        self.uinput.syn()
-        self.uinput.write(e.EV_KEY, e.KEY_RIGHTSHIFT, 0)
-        self.uinput.syn()
+        keys += [(e.KEY_LEFTSHIFT, 0), (e.KEY_RIGHTSHIFT, 0)]
+        self._emit_keys(keys)
         self.cancel_compose()
     
+    def _passthrough_compose_sequence(self, target: Optional[Tuple[int, int]] = None):
+        """Replay the swallowed trigger and compose keys, plus target if given, in one write"""
+        # Modifier press/release, then compose (with shift if needed)
+        keys = [(self.current_trigger, 1), (self.current_trigger, 0)]
+        if self.compose_shifted:
+            keys += [(e.KEY_LEFTSHIFT, 1), (self.current_compose, 1),
+                     (self.current_compose, 0), (e.KEY_LEFTSHIFT, 0)]
+        else:
+            keys += [(self.current_compose, 1), (self.current_compose, 0)]
+        if target is not None:
+            keys.append(target)
+        self._emit_keys(keys)
+
     def check_timeout(self):
         """Check if modifier or compose sequence has timed out"""
-        now = time.time()
+        if not self.deadline or time.monotonic() < self.deadline:
+            return
 
         if self.state == 'TRIGGER_PRESSED':
-            if now - self.trigger_start_time >= self.timeout_sec:
-                logger.debug("Modifier timeout - passing through")
-                self.uinput.write(e.EV_KEY, self.current_trigger, 1)
-                self.uinput.syn()
-                self.uinput.write(e.EV_KEY, self.current_trigger, 0)
-                self.uinput.syn()
-                self.cancel_compose()
+            logger.debug("Modifier timeout - passing through")
+            self._emit_keys([(self.current_trigger, 1), (self.current_trigger, 0)])
+            self.cancel_compose()
 
         elif self.state == 'WAITING_TARGET':
-            if now - self.compose_start_time >= self.timeout_sec:
-                logger.debug("Compose timeout - passing through original keys")
-                # Send modifier press/release
-                self.uinput.write(e.EV_KEY, self.current_trigger, 1)
-                self.uinput.syn()
-                self.uinput.write(e.EV_KEY, self.current_trigger, 0)
-                self.uinput.syn()
-                # Send compose press/release (with shift if needed)
-                if self.compose_shifted:
-                    self.uinput.write(e.EV_KEY, e.KEY_LEFTSHIFT, 1)
-                    self.uinput.syn()
-                self.uinput.write(e.EV_KEY, self.current_compose, 1)
-                self.uinput.syn()
-                self.uinput.write(e.EV_KEY, self.current_compose, 0)
-                self.uinput.syn()
-                if self.compose_shifted:
-                    self.uinput.write(e.EV_KEY, e.KEY_LEFTSHIFT, 0)
-                    self.uinput.syn()
-                self.cancel_compose()
+            logger.debug("Compose timeout - passing through original keys")
+            self._passthrough_compose_sequence()
+            self.cancel_compose()
     
     def handle_event(self, event):
         """Process a keyboard event"""
         # Test mode: pass everything through untouched so the GUI tester can process it
-        if TEST_MODE_FILE.exists():
+        if self.test_mode:
             self.uinput.write(event.type, event.code, event.value)
             if event.type == e.EV_SYN:
                 pass  # syn already written
@@ -872,15 +959,14 @@ class UmlautDaemon:
         # State machine
         if self.state == 'IDLE':
             # Check if this is a modifier key press
-            if value == 1 and key_code in self.config.trigger_keys_list:
+            if value == 1 and key_code in self.config.trigger_key_set:
                 # Check if other modifiers are already pressed
                 # Shift is OK (can be part of SHIFT+KEY compose sequences)
                 # But Ctrl/Meta indicate a regular shortcut
-                other_modifiers = {e.KEY_LEFTCTRL, e.KEY_RIGHTCTRL,
-                                  e.KEY_LEFTMETA, e.KEY_RIGHTMETA}
+                other_modifiers = self.pressed_keys & self.CTRL_META_KEYS
                 other_modifiers.discard(key_code)  # Remove current modifier
                 
-                if self.pressed_keys & other_modifiers:
+                if other_modifiers:
                     # Ctrl or Meta already pressed - this is a regular shortcut
                     logger.debug(f"Modifier {key_code} with other mods - passing through")
                     self.uinput.write(e.EV_KEY, key_code, value)
@@ -888,7 +974,7 @@ class UmlautDaemon:
                 
                 self.current_trigger = key_code
                 self.state = 'TRIGGER_PRESSED'
-                self.trigger_start_time = time.time()
+                self.deadline = time.monotonic() + self.timeout_sec
                 logger.debug(f"Modifier pressed: {key_code}")
                 return  # Don't pass through yet
             
@@ -897,21 +983,16 @@ class UmlautDaemon:
             if value == 0 and key_code == self.current_trigger:
                 logger.debug("Modifier released early - passing through")
                 # Send modifier press and release
-                self.uinput.write(e.EV_KEY, self.current_trigger, 1)
-                self.uinput.syn()
-                self.uinput.write(e.EV_KEY, self.current_trigger, 0)
-                self.uinput.syn()
+                self._emit_keys([(self.current_trigger, 1), (self.current_trigger, 0)])
                 self.cancel_compose()
                 return
             
             # Check if another modifier key is pressed (e.g., Alt then Ctrl)
             # BUT: Don't abort if Shift+NextKey could be a valid compose sequence
-            if value == 1 and key_code in (e.KEY_LEFTCTRL, e.KEY_RIGHTCTRL,
-                                           e.KEY_LEFTSHIFT, e.KEY_RIGHTSHIFT,
-                                           e.KEY_LEFTMETA, e.KEY_RIGHTMETA):
-                if key_code not in self.config.trigger_keys_list:
+            if value == 1 and (key_code in self.SHIFT_KEYS or key_code in self.CTRL_META_KEYS):
+                if key_code not in self.config.trigger_key_set:
                     # Check if this might be part of a SHIFT+KEY compose sequence
-                    if key_code in (e.KEY_LEFTSHIFT, e.KEY_RIGHTSHIFT):
+                    if key_code in self.SHIFT_KEYS:
                         # Don't abort yet - wait to see if next key is a valid compose key
                         logger.debug(f"Shift pressed during modifier - waiting for compose key")
                         return  # Continue in MODIFIER_PRESSED state
@@ -919,55 +1000,41 @@ class UmlautDaemon:
                     # For other modifiers (Ctrl, Meta), this is definitely a shortcut
                     logger.debug(f"Additional modifier {key_code} pressed - passing through")
                     # Send original modifier, then this key
-                    self.uinput.write(e.EV_KEY, self.current_trigger, 1)
-                    self.uinput.syn()
-                    self.uinput.write(e.EV_KEY, key_code, value)
-                    self.uinput.syn()
+                    self._emit_keys([(self.current_trigger, 1), (key_code, value)])
                     self.cancel_compose()
                     return
             
             # Check if this is an ignored key (e.g., TAB for Alt-Tab)
-            if value == 1 and key_code in self.config.passthrough_keys:
+            if value == 1 and key_code in self.config.passthrough_key_set:
                 logger.debug(f"Ignored key {key_code} - passing through")
                 # Send modifier and ignored key
-                self.uinput.write(e.EV_KEY, self.current_trigger, 1)
-                self.uinput.syn()
-                self.uinput.write(e.EV_KEY, key_code, value)
-                self.uinput.syn()
+                self._emit_keys([(self.current_trigger, 1), (key_code, value)])
                 self.cancel_compose()
                 return
             
             # Check if this is a compose key press (while modifier held)
             if value == 1 and key_code != self.current_trigger:
                 # Only enter compose mode if this key has defined sequences
-                if key_code not in self.valid_compose_keys:
+                if key_code not in self.config.compose_keys:
                     logger.debug(f"Key {key_code} has no sequences - passing through as shortcut")
                     # Send modifier and key as regular shortcut
-                    self.uinput.write(e.EV_KEY, self.current_trigger, 1)
-                    self.uinput.syn()
-                    self.uinput.write(e.EV_KEY, key_code, value)
-                    self.uinput.syn()
+                    self._emit_keys([(self.current_trigger, 1), (key_code, value)])
                     self.cancel_compose()
                     return
                 
                 self.current_compose = key_code
                 # Check if shift is pressed
-                self.compose_shifted = (e.KEY_LEFTSHIFT in self.pressed_keys or 
-                                       e.KEY_RIGHTSHIFT in self.pressed_keys)
+                self.compose_shifted = not self.pressed_keys.isdisjoint(self.SHIFT_KEYS)
                 self.state = 'COMPOSE_PRESSED'
                 logger.debug(f"Compose key pressed: {key_code} (shifted={self.compose_shifted})")
                 return  # Don't pass through yet
             
         elif self.state == 'COMPOSE_PRESSED':
             # Ignore modifier key presses/releases (user might hold shift through the sequence)
-            if key_code in (e.KEY_LEFTSHIFT, e.KEY_RIGHTSHIFT, 
-                           e.KEY_LEFTCTRL, e.KEY_RIGHTCTRL,
-                           e.KEY_LEFTALT, e.KEY_RIGHTALT,
-                           e.KEY_LEFTMETA, e.KEY_RIGHTMETA):
+            if key_code in self.MODIFIER_KEYS:
                 # Pass Shift releases through so X11 doesn't think Shift is still held
-                if value == 0 and key_code in (e.KEY_LEFTSHIFT, e.KEY_RIGHTSHIFT):
-                    self.uinput.write(e.EV_KEY, key_code, 0)
-                    self.uinput.syn()
+                if value == 0 and key_code in self.SHIFT_KEYS:
+                    self._emit_keys([(key_code, 0)])
             
             # Waiting for modifier and compose to be released
             if value == 0:
@@ -978,7 +1045,7 @@ class UmlautDaemon:
                     if modifier_released and compose_released:
                         # Both released - now waiting for target
                         self.state = 'WAITING_TARGET'
-                        self.compose_start_time = time.time()
+                        self.deadline = time.monotonic() + self.timeout_sec
                         logger.debug("Waiting for target key")
                         return
                     # Partial release - keep waiting
@@ -987,50 +1054,47 @@ class UmlautDaemon:
         elif self.state == 'WAITING_TARGET':
             # Ignore modifier key presses/releases while waiting for target
             # (user might press Shift+A, we only care about the A)
-            if key_code in (e.KEY_LEFTSHIFT, e.KEY_RIGHTSHIFT, 
-                           e.KEY_LEFTCTRL, e.KEY_RIGHTCTRL,
-                           e.KEY_LEFTALT, e.KEY_RIGHTALT,
-                           e.KEY_LEFTMETA, e.KEY_RIGHTMETA):
+            if key_code in self.MODIFIER_KEYS:
                 # Pass Shift releases through so X11 doesn't think Shift is still held
-                if value == 0 and key_code in (e.KEY_LEFTSHIFT, e.KEY_RIGHTSHIFT):
-                    self.uinput.write(e.EV_KEY, key_code, 0)
-                    self.uinput.syn()
+                if value == 0 and key_code in self.SHIFT_KEYS:
+                    self._emit_keys([(key_code, 0)])
                 return  # Stay in WAITING_TARGET
             
             # Waiting for target key press
             if value == 1:  # Key press
-                # Build target keys
-                target_keys = [key_code]
+                # Build target keys in config order: Alt, Ctrl, Shift, key
+                target_keys = []
                 target_was_shifted = False
                 
                 logger.debug(f"pressed_keys at target time: {self.pressed_keys}")
                 # Check modifiers on target
-                if e.KEY_LEFTSHIFT in self.pressed_keys or e.KEY_RIGHTSHIFT in self.pressed_keys:
-                    target_keys.insert(0, e.KEY_LEFTSHIFT)
+                pressed = self.pressed_keys
+                if not pressed.isdisjoint(self.ALT_KEYS):
+                    if key_code not in self.config.trigger_key_set:
+                        target_keys.append(e.KEY_LEFTALT)
+                if not pressed.isdisjoint(self.CTRL_KEYS):
+                    target_keys.append(e.KEY_LEFTCTRL)
+                if not pressed.isdisjoint(self.SHIFT_KEYS):
+                    target_keys.append(e.KEY_LEFTSHIFT)
                     target_was_shifted = True
-                if e.KEY_LEFTCTRL in self.pressed_keys or e.KEY_RIGHTCTRL in self.pressed_keys:
-                    target_keys.insert(0, e.KEY_LEFTCTRL)
-                if e.KEY_LEFTALT in self.pressed_keys or e.KEY_RIGHTALT in self.pressed_keys:
-                    if key_code not in self.config.trigger_keys_list:
-                        target_keys.insert(0, e.KEY_LEFTALT)
+                target_keys.append(key_code)
                 
-                # Build lookup key with compose_shifted flag
-                lookup_key = (self.current_trigger, self.compose_shifted, self.current_compose, *target_keys)
+                # Build lookup key with compose_shifted flag; sequences are
+                # stored once for all trigger keys, so the trigger is not part of it
+                lookup_key = (self.compose_shifted, self.current_compose, *target_keys)
                 
                 logger.debug(f"Looking up: {lookup_key}")
                 
                 # Try to find match
-                matched_seq = None
-                if lookup_key in self.config.sequences:
-                    matched_seq = self.config.sequences[lookup_key]
-                elif target_was_shifted:
+                sequences = self.config.sequences
+                matched_seq = sequences.get(lookup_key)
+                if matched_seq is None and target_was_shifted:
                     # If target was shifted, also try without shift in lookup
                     # This allows "u" config to match both "u" and "U" (Shift+U)
-                    unshifted_target_keys = [k for k in target_keys if k not in (e.KEY_LEFTSHIFT, e.KEY_RIGHTSHIFT)]
-                    unshifted_lookup_key = (self.current_trigger, self.compose_shifted, self.current_compose, *unshifted_target_keys)
+                    unshifted_target_keys = [k for k in target_keys if k not in self.SHIFT_KEYS]
+                    unshifted_lookup_key = (self.compose_shifted, self.current_compose, *unshifted_target_keys)
                     logger.debug(f"Also trying unshifted lookup: {unshifted_lookup_key}")
-                    if unshifted_lookup_key in self.config.sequences:
-                        matched_seq = self.config.sequences[unshifted_lookup_key]
+                    matched_seq = sequences.get(unshifted_lookup_key)
                 
                 if matched_seq:
                     # Match found!
@@ -1044,41 +1108,16 @@ class UmlautDaemon:
                 else:
                     # No match - pass through modifier, compose, then target
                     logger.debug(f"No match for {lookup_key} - passing through")
-                    
-                    # Send modifier press and release
-                    self.uinput.write(e.EV_KEY, self.current_trigger, 1)
-                    self.uinput.syn()
-                    self.uinput.write(e.EV_KEY, self.current_trigger, 0)
-                    self.uinput.syn()
-                    
-                    # Send compose press and release (with shift if needed)
-                    if self.compose_shifted:
-                        self.uinput.write(e.EV_KEY, e.KEY_LEFTSHIFT, 1)
-                        self.uinput.syn()
-                    self.uinput.write(e.EV_KEY, self.current_compose, 1)
-                    self.uinput.syn()
-                    self.uinput.write(e.EV_KEY, self.current_compose, 0)
-                    self.uinput.syn()
-                    if self.compose_shifted:
-                        self.uinput.write(e.EV_KEY, e.KEY_LEFTSHIFT, 0)
-                        self.uinput.syn()
-                    
-                    # Now send the target key
-                    self.uinput.write(e.EV_KEY, key_code, value)
-                    self.uinput.syn()
-                    
+                    self._passthrough_compose_sequence((key_code, value))
                     self.cancel_compose()
                     return
         
         # Pass through if not handled
-        self.uinput.write(e.EV_KEY, key_code, value)
-        self.uinput.syn()
+        self._emit_keys([(key_code, value)])
     
     def _check_xdotool(self):
         """Verify xdotool is available and working. Sets self.xdotool_available flag."""
         self.xdotool_available = False
-        self._inotify_fd = None   # inotify fd for USB hotplug detection
-        self._inotify_wd = None
 
         # Check for Wayland first
         if (os.environ.get('XDG_SESSION_TYPE') == 'wayland'
@@ -1107,6 +1146,110 @@ class UmlautDaemon:
         except subprocess.TimeoutExpired:
             logger.warning("xdotool timed out during check — Unicode output disabled")
 
+    def _setup_xtest(self):
+        """Open an X connection for XTEST Unicode output, if python-xlib is available.
+
+        Characters are typed through spare keycodes (those with no keysyms
+        in the current keymap), bound on demand the same way xdotool does.
+        """
+        if xdisplay is None or 'DISPLAY' not in os.environ:
+            return
+        if (os.environ.get('XDG_SESSION_TYPE') == 'wayland'
+                or os.environ.get('WAYLAND_DISPLAY')):
+            return
+        try:
+            disp = xdisplay.Display()
+        except Exception as ex:
+            logger.warning(f"XTEST unavailable — using xdotool for Unicode output: {ex}")
+            return
+        # Any early exit from here on must close disp
+        free = None
+        try:
+            if not disp.has_extension('XTEST'):
+                logger.info("XTEST extension missing — using xdotool for Unicode output")
+            else:
+                first = disp.display.info.min_keycode
+                count = disp.display.info.max_keycode - first + 1
+                mapping = disp.get_keyboard_mapping(first, count)
+                free = [first + i for i, syms in enumerate(mapping) if not any(syms)]
+                if not free:
+                    logger.info("No spare keycodes — using xdotool for Unicode output")
+        except Exception as ex:
+            logger.warning(f"XTEST unavailable — using xdotool for Unicode output: {ex}")
+        if not free:
+            disp.close()
+            return
+        self._xdisplay = disp
+        self._xtest_free = free
+        self._xtest_bound.clear()
+        logger.info(f"XTEST Unicode output ready ({len(free)} spare keycodes)")
+
+    def _xtest_keycode(self, keysym: int) -> int:
+        """Return a scratch keycode bound to keysym, rebinding the least recently used one if needed"""
+        keycode = self._xtest_bound.get(keysym)
+        if keycode is not None:
+            self._xtest_bound.move_to_end(keysym)
+            return keycode
+        if self._xtest_free:
+            keycode = self._xtest_free.pop()
+        else:
+            _, keycode = self._xtest_bound.popitem(last=False)
+        # Same keysym on both levels, so a held Shift doesn't change the result
+        self._xdisplay.change_keyboard_mapping(keycode, [(keysym, keysym)])
+        self._xtest_bound[keysym] = keycode
+        return keycode
+
+    def _xtest_type(self, text: str) -> int:
+        """Type text through XTEST. Returns the number of characters sent;
+        fewer than len(text) (and XTEST disabled) on X errors."""
+        # XTEST events skip the kernel; give uinput keys written just before
+        # (e.g. the ASCII part of a mixed string) time to reach X first
+        wait = self._last_frames_time + XTEST_SETTLE_SEC - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        sent = 0
+        try:
+            for char in text:
+                cp = ord(char)
+                # Latin-1 keysyms equal the code point; the rest use Unicode keysyms
+                if 0x20 <= cp <= 0x7e or 0xa0 <= cp <= 0xff:
+                    keysym = cp
+                elif cp < 0x20 or cp == 0x7f:
+                    keysym = _XTEST_CONTROL_KEYSYMS.get(char)
+                    if keysym is None:
+                        logger.debug(f"XTEST: skipping control character {char!r}")
+                        sent += 1
+                        continue
+                else:
+                    keysym = 0x01000000 | cp
+                keycode = self._xtest_keycode(keysym)
+                xtest.fake_input(self._xdisplay, X.KeyPress, keycode)
+                xtest.fake_input(self._xdisplay, X.KeyRelease, keycode)
+                # Flush per character so a failure leaves a known resume point
+                self._xdisplay.flush()
+                sent += 1
+            self._xdisplay.sync()
+            logger.debug(f"XTEST typed: {text!r}")
+        except Exception as ex:
+            logger.warning(f"XTEST failed ({ex}) — falling back to xdotool")
+            self._close_xtest()
+        return sent
+
+    def _close_xtest(self):
+        """Unbind scratch keycodes and close the X connection"""
+        disp, self._xdisplay = self._xdisplay, None
+        if disp is None:
+            return
+        try:
+            for keycode in self._xtest_bound.values():
+                disp.change_keyboard_mapping(keycode, [(0, 0)])
+            disp.sync()
+            disp.close()
+        except Exception:
+            pass
+        self._xtest_bound.clear()
+        self._xtest_free = []
+
     def _setup_inotify(self):
         """Set up inotify watch on /dev/input for new keyboard detection."""
         try:
@@ -1120,6 +1263,7 @@ class UmlautDaemon:
                 raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
             self._inotify_fd = fd
             self._inotify_wd = wd
+            self._inotify_buf = bytearray(4096)  # reused by every _drain_inotify read
             logger.info("inotify watchdog active on /dev/input")
         except Exception as ex:
             logger.warning(f"inotify unavailable — USB hotplug detection disabled: {ex}")
@@ -1130,55 +1274,64 @@ class UmlautDaemon:
         if self._inotify_fd is None:
             return []
         new_paths = []
-        # Each inotify event: 16 bytes header + name (len in header)
-        EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
         try:
-            data = os.read(self._inotify_fd, 4096)
+            data = self._inotify_buf
+            end = os.readv(self._inotify_fd, [data])
             offset = 0
-            while offset < len(data):
-                if offset + EVENT_HEADER.size > len(data):
-                    break
-                wd, mask, cookie, name_len = EVENT_HEADER.unpack_from(data, offset)
-                offset += EVENT_HEADER.size
-                if name_len > 0:
-                    name = data[offset:offset + name_len].rstrip(b'\x00').decode('utf-8', errors='ignore')
-                    offset += name_len
-                    if name.startswith('event'):
-                        new_paths.append(f'/dev/input/{name}')
-                else:
-                    offset += name_len
+            while offset + _INOTIFY_EVENT.size <= end:
+                wd, mask, cookie, name_len = _INOTIFY_EVENT.unpack_from(data, offset)
+                offset += _INOTIFY_EVENT.size
+                # Only eventN nodes matter; skip js*/mouse*/mice without copying
+                if name_len and data.startswith(b'event', offset):
+                    name = data[offset:offset + name_len].rstrip(b'\x00').decode('ascii', errors='ignore')
+                    new_paths.append(f'/dev/input/{name}')
+                offset += name_len
         except BlockingIOError:
             pass  # No events pending
         except Exception as ex:
             logger.debug(f"inotify read error: {ex}")
         return new_paths
 
-    def _check_new_devices(self, device_map: dict):
-        """Check inotify for new keyboards and grab them."""
-        new_paths = self._drain_inotify()
-        for path in new_paths:
-            if path in {dev.path for dev in self.devices}:
+    def _check_new_devices(self):
+        """Queue new device nodes from inotify; they are opened once udev settles."""
+        known = {dev.path for dev in self.devices}
+        settle_at = time.monotonic() + HOTPLUG_SETTLE_SEC
+        for path in self._drain_inotify():
+            if path not in known and path not in self._pending_devices:
+                self._pending_devices[path] = (settle_at, 1)
+
+    def _open_pending_devices(self) -> list:
+        """Open and grab queued devices whose settle time has passed.
+
+        Returns the newly grabbed keyboards. A node that can't be opened yet
+        (udev may not have applied permissions) is retried a few times.
+        """
+        now = time.monotonic()
+        grabbed = []
+        for path, (due, attempt) in list(self._pending_devices.items()):
+            if due > now:
                 continue
+            del self._pending_devices[path]
             try:
-                import time as _time
-                _time.sleep(0.3)  # Let udev settle
                 dev = evdev.InputDevice(path)
-                if dev.name == 'umlaut-virtual-keyboard':
-                    dev.close()
-                    continue
-                caps = dev.capabilities()
-                REAL_KEYS = {e.KEY_A, e.KEY_SPACE, e.KEY_ENTER,
-                             e.KEY_BACKSPACE, e.KEY_LEFTSHIFT, e.KEY_LEFTCTRL}
-                keys = set(caps.get(e.EV_KEY, []))
-                if e.EV_KEY in caps and len(keys & REAL_KEYS) >= 4:
+            except Exception as ex:
+                if attempt < HOTPLUG_MAX_ATTEMPTS:
+                    self._pending_devices[path] = (now + HOTPLUG_SETTLE_SEC, attempt + 1)
+                else:
+                    logger.debug(f"Hotplug: could not open {path}: {ex}")
+                continue
+            try:
+                if self._is_keyboard(dev):
                     dev.grab()
                     self.devices.append(dev)
-                    device_map[dev.fd] = dev
+                    grabbed.append(dev)
                     logger.info(f"Hotplug: grabbed new keyboard {dev.name} at {path}")
                 else:
                     dev.close()
             except Exception as ex:
-                logger.debug(f"Hotplug: could not open {path}: {ex}")
+                logger.debug(f"Hotplug: could not grab {path}: {ex}")
+                dev.close()
+        return grabbed
 
     def run(self):
         """Main event loop"""
@@ -1202,60 +1355,73 @@ class UmlautDaemon:
         self.grab_devices()
         self._setup_inotify()
         self._check_xdotool()
+        self._setup_xtest()
         
         logger.info("Umlaut daemon ready. Press Ctrl+C to stop.")
         
+        # epoll keeps the watched set in the kernel instead of passing every
+        # fd on each wakeup like select(); level-triggered, since read()
+        # drains each ready device anyway
+        poller = select.epoll()
         try:
-            # Create device map for select
             device_map = {dev.fd: dev for dev in self.devices}
-            
-            # Add inotify fd to watched fds if available
-            watch_fds = set(device_map.keys())
+            for fd in device_map:
+                poller.register(fd, select.EPOLLIN)
             if self._inotify_fd is not None:
-                watch_fds.add(self._inotify_fd)
+                poller.register(self._inotify_fd, select.EPOLLIN)
 
             while self.running:
+                if self.reload_pending:
+                    self.reload_pending = False
+                    self.reload_config()
+
                 # Check timeout
                 self.check_timeout()
 
-                # Dynamic select timeout: wait only until next deadline
-                now = time.time()
-                if self.state == 'TRIGGER_PRESSED':
-                    deadline = self.trigger_start_time + self.timeout_sec
-                elif self.state == 'WAITING_TARGET':
-                    deadline = self.compose_start_time + self.timeout_sec
+                # Dynamic poll timeout: wait only until next deadline
+                if self.state in ('TRIGGER_PRESSED', 'WAITING_TARGET'):
+                    select_timeout = max(0.005, self.deadline - time.monotonic())
                 else:
-                    deadline = now + 1.0  # IDLE: wake up at most every 1s
-                select_timeout = max(0.005, deadline - now)
-                r, w, x = select.select(watch_fds, [], [], select_timeout)
+                    select_timeout = 1.0  # IDLE: wake up at most every 1s
+                if self._pending_devices:
+                    due = min(due for due, _ in self._pending_devices.values())
+                    select_timeout = min(select_timeout, max(0.005, due - time.monotonic()))
+                r = [fd for fd, _ in poller.poll(select_timeout)]
 
                 # Handle inotify events (new USB keyboard plugged in)
-                if self._inotify_fd in r:
-                    self._check_new_devices(device_map)
-                    watch_fds = set(device_map.keys())
-                    if self._inotify_fd is not None:
-                        watch_fds.add(self._inotify_fd)
-
+                if self._inotify_fd is not None and self._inotify_fd in r:
+                    self._check_new_devices()
+                if self._pending_devices:
+                    for dev in self._open_pending_devices():
+                        device_map[dev.fd] = dev
+                        poller.register(dev.fd, select.EPOLLIN)
+
+                # One stat per wakeup rather than one per event
+                self.test_mode = TEST_MODE_FILE.exists()
                 for fd in r:
                     if fd == self._inotify_fd:
                         continue
                     device = device_map[fd]
                     try:
+                        # read() drains every queued event until EAGAIN, so a
+                        # burst is handled in one wakeup. EV_SYN frames are
+                        # forwarded by handle_event itself; no extra syn() here.
                         for event in device.read():
                             self.handle_event(event)
-                            if event.type == e.EV_SYN:
-                                self.uinput.syn()
+                    except BlockingIOError:
+                        continue  # spurious wakeup, nothing queued
                     except OSError:
                         # Device disconnected - remove from map to prevent infinite loop
                         logger.warning(f"Device {device.name} disconnected - removing from monitoring")
                         del device_map[fd]
                         self.devices.remove(device)
-                        watch_fds.discard(fd)
+                        poller.unregister(fd)
                         continue
         
         except KeyboardInterrupt:
             logger.info("Shutting down...")
         finally:
+            poller.close()
             self.cleanup()
         
         return 0
@@ -1271,6 +1437,8 @@ class UmlautDaemon:
         for device in self.devices:
             device.close()
         
+        self._close_xtest()
+        
         if self._inotify_fd is not None:
             try:
                 os.close(self._inotify_fd)
@@ -1279,15 +1447,23 @@ class UmlautDaemon:
         logger.info("Cleanup complete")
     
     def reload_config(self):
-        """Reload configuration file"""
+        """Reload configuration file
+
+        The new config is built separately and swapped in only once it has
+        loaded, so a broken file leaves the running table untouched.
+        """
         logger.info("Reloading configuration...")
         try:
-            self.config.load_config()
-            # Reset state — force-release any stuck keys
-            self.force_release_all()
-            logger.info("Configuration reloaded successfully")
-        except Exception as e:
+            config = UmlautConfig()
+        except (Exception, SystemExit) as e:  # _fatal_error raises SystemExit
             logger.error(f"Failed to reload config: {e}")
+            return
+        self.config = config
+        self.timeout_ms = config.timeout_ms
+        self.timeout_sec = self.timeout_ms / 1000.0
+        # Reset state — force-release any stuck keys
+        self.force_release_all()
+        logger.info("Configuration reloaded successfully")
 
 
 _daemon_instance = None
@@ -1303,6 +1479,13 @@ def signal_handler(signum, frame):
     sys.exit(0)
 
 
+def reload_handler(signum, frame):
+    """Handle SIGHUP (systemctl reload): defer the reload to the event loop"""
+    logger.info(f"Received signal {signum}")
+    if _daemon_instance is not None:
+        _daemon_instance.reload_pending = True
+
+
 def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(
@@ -1327,6 +1510,7 @@ def main():
     # Setup signal handlers
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGHUP, reload_handler)
     
     global _daemon_instance
     daemon = UmlautDaemon()